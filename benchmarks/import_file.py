@@ -0,0 +1,74 @@
+#!/bin/python3
+'''
+    Import benchmark  
+    file name: import_file.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import os
+import sys
+import time
+import tempfile
+
+# Run from the root of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.log_manager import LogManager
+from classes.cocito.eugolino import EUgolino
+from classes.cocito.download_candidate import DownloadCandidate
+
+def make_file(path: str, lines: int) -> None:
+    """
+    Writes a synthetic links file.
+
+    Args:
+        path (str): Path of the file.
+        lines (int): Number of lines.
+    """
+    with open(path, "w") as f:
+        for i in range(lines):
+            f.write("3%04dR%05d,http://publications.europa.eu/resource/celex/3%04dR%05d\n" % (i % 10000, i, i % 10000, i))
+
+def line_by_line(path: str) -> int:
+    """
+    Imports the file one line at a time with make_candidate, as import_file did before the bulk parser.
+
+    Args:
+        path (str): Path of the file.
+
+    Returns:
+        int: Number of candidates.
+    """
+    candidates = []
+    with open(path, "r") as f:
+        for line in f:
+            candidate = DownloadCandidate.make_candidate(line)
+            if candidate is not None:
+                candidates.append(candidate)
+    return len(candidates)
+
+def bulk(path: str) -> int:
+    """
+    Imports the file with the bulk parser of import_file.
+
+    Args:
+        path (str): Path of the file.
+
+    Returns:
+        int: Number of candidates.
+    """
+    e = EUgolino(file_in=path, output=LogManager(out=open(os.devnull, "w")))
+    e.import_file()
+    return len(e.candidates)
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 3000000
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "links.txt")
+        make_file(path, lines)
+        for name, method in (("line by line", line_by_line), ("bulk", bulk)):
+            start = time.perf_counter()
+            n = method(path)
+            elapsed = time.perf_counter() - start
+            print(f"{name}:\t{n} rows\t{elapsed:.2f} s\t{n / elapsed:,.0f} rows/s")
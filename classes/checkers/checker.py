@@ -8,7 +8,8 @@
 
 from abc import ABC, abstractmethod
 import threading
-import requests
+
+from classes.http_pool import HTTPPool
 
 
 class Checker(ABC, threading.Thread):
@@ -26,8 +27,10 @@ class Checker(ABC, threading.Thread):
     """Flag indicating if the checker should stop"""
     e:threading.Event = threading.Event()
     """Event for waiting"""
+    pool:HTTPPool = HTTPPool()
+    """Pool of HTTP connections"""
 
-    def __init__(self, name:str = "Checker", sleep_time:int = 10, url:str = None, send_check:bool = False):
+    def __init__(self, name:str = "Checker", sleep_time:int = 10, url:str = None, send_check:bool = False, pool:HTTPPool = None):
         """
         Constructor
 
@@ -38,13 +41,18 @@ class Checker(ABC, threading.Thread):
             sleep_time (int, optional): Minutes to wait before checking again. Defaults to 10.
             url (str, optional): URL to send the check. Defaults to None.
             send_check (bool, optional): Flag indicating if the check should be sent. Defaults to False
+            pool (HTTPPool, optional): Pool of HTTP connections. Defaults to None.
         """
         self.sleep_time = sleep_time
+        if pool is not None:
+            self.pool = pool
         self.url = url
         if url is None:    
             self.send_check = False
         else:
             self.send_check = send_check
+        # Each checker is woken up by its own stop
+        self.e = threading.Event()
         threading.Thread.__init__(self, name=name)
     
     def __str__(self) -> str:
@@ -96,7 +104,7 @@ class Checker(ABC, threading.Thread):
             # Make data
             data = "Name:\t" + self.name + "\n\n" + self.get_progresses()
         # Send the check with current length
-        r = requests.post(url=url, data=data)
+        r = self.pool.post(url=url, data=data)
         # Return the result
         return r.ok
     
@@ -107,7 +115,7 @@ class Checker(ABC, threading.Thread):
         Returns:
             bool: True if the check was sent, False otherwise
         """
-        return requests.post(url=self.url+"/start", data=str("Name:\t" + self.name)).ok
+        return self.pool.post(url=self.url+"/start", data=str("Name:\t" + self.name)).ok
 
     def send_done(self) -> bool:
         """
@@ -119,7 +127,7 @@ class Checker(ABC, threading.Thread):
         # Make data
         data = str("Name:\t" + self.name + "\n\nDONE\n\n" + self.get_progresses())
         # Send the message
-        r = requests.post(url=self.url, data=data, timeout=10)
+        r = self.pool.post(url=self.url, data=data, timeout=10)
         # Return the result
         return r.ok
 
@@ -171,9 +179,10 @@ class Checker(ABC, threading.Thread):
             sleep_time = self.sleep_time
         # Set the event
         self.e.clear()
-        # Sleep for the specified time
+        # Sleep for the specified time, unless a stop came before the event was cleared
         try:
-            self.e.wait(sleep_time)
+            if not self.halt:
+                self.e.wait(sleep_time)
         except:
             pass
         # Check and send
@@ -205,9 +214,7 @@ class Checker(ABC, threading.Thread):
         # Send the starting check
         if send:
             self.send_start()
-        # Initialize the halt flag
-        self.halt = False
-        # Forever
+        # Forever, a stop before this point is not lost
         while not self.halt:
             # Check
             self.timed_check(sleep_time=sleep_time,url=url, send=send)
@@ -0,0 +1,188 @@
+#!/bin/python3
+'''
+    EUgolino Directory Watcher  
+    file name: directory_watcher.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import os
+import select
+import struct
+import threading
+import ctypes
+import ctypes.util
+
+class DirectoryWatcher(threading.Thread):
+    """
+    A class that keeps the number of files in a directory up to date with the inotify events of Linux.
+
+    The directory is counted once, then each created or moved in file adds one and each deleted or moved out file removes one,
+    so that the count never lists the directory again. When the kernel drops events the directory is counted again.
+    A file replaced by a rename, or written while the directory is first counted, can be counted twice until the next full count.
+    """
+
+    IN_MOVED_FROM:int = 0x00000040
+    """A file was moved out of the directory."""
+    IN_MOVED_TO:int = 0x00000080
+    """A file was moved into the directory."""
+    IN_CREATE:int = 0x00000100
+    """A file was created in the directory."""
+    IN_DELETE:int = 0x00000200
+    """A file was deleted from the directory."""
+    IN_DELETE_SELF:int = 0x00000400
+    """The directory was deleted."""
+    IN_MOVE_SELF:int = 0x00000800
+    """The directory was moved."""
+    IN_Q_OVERFLOW:int = 0x00004000
+    """The kernel dropped some events."""
+    IN_IGNORED:int = 0x00008000
+    """The watch was removed."""
+    event_format:struct.Struct = struct.Struct("iIII")
+    """Header of an event: watch, mask, cookie and length of the name."""
+    libc = None
+    """The C library with the inotify functions, loaded by the first watcher."""
+
+    directory:str = 'pdf/'
+    """Directory to watch."""
+    ignored_suffixes:tuple = ()
+    """Suffixes of the files which are not counted."""
+    count:int = 0
+    """Current number of files in the directory."""
+    poll_interval:float = 1.0
+    """Seconds between two checks of the stop event while no file changes."""
+    fd:int = -1
+    """File descriptor of the inotify instance."""
+    e:threading.Event = None
+    """Event set to stop the watcher."""
+
+    def __init__(self, directory:str, ignored_suffixes:tuple = None, poll_interval:float = None) -> None:
+        """
+        Costructor
+
+        Initializes a new instance of the Directory Watcher class and starts watching the directory.
+
+        Args:
+            directory (str): Directory to watch.
+            ignored_suffixes (tuple, optional): Suffixes of the files which are not counted. Defaults to None.
+            poll_interval (float, optional): Seconds between two checks of the stop event. Defaults to None.
+
+        Raises:
+            OSError: If inotify is not available or the directory can not be watched.
+        """
+        threading.Thread.__init__(self, name="Watcher " + directory, daemon=True)
+        self.directory = directory
+        if ignored_suffixes is not None:
+            self.ignored_suffixes = tuple(ignored_suffixes)
+        if poll_interval is not None and poll_interval > 0:
+            self.poll_interval = poll_interval
+        self.e = threading.Event()
+        libc = DirectoryWatcher.load_libc()
+        # Watch the directory before counting it, so that no file is missed
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        mask = self.IN_CREATE | self.IN_MOVED_TO | self.IN_DELETE | self.IN_MOVED_FROM | self.IN_DELETE_SELF | self.IN_MOVE_SELF
+        if libc.inotify_add_watch(self.fd, os.fsencode(self.directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, os.strerror(errno), self.directory)
+        try:
+            self.count = DirectoryWatcher.count_files(self.directory, self.ignored_suffixes)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    @staticmethod
+    def load_libc():
+        """
+        Loads the C library with the inotify functions.
+
+        Returns:
+            ctypes.CDLL: The C library.
+
+        Raises:
+            OSError: If the C library has no inotify functions, for instance out of Linux.
+        """
+        if DirectoryWatcher.libc is None:
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            except (OSError, TypeError):
+                raise OSError("C library not available")
+            if not hasattr(libc, "inotify_init1"):
+                raise OSError("inotify not available")
+            DirectoryWatcher.libc = libc
+        return DirectoryWatcher.libc
+
+    @staticmethod
+    def count_files(directory:str, ignored_suffixes:tuple = ()) -> int:
+        """
+        Counts the files in a directory without building the list of their names.
+
+        Args:
+            directory (str): Directory to count.
+            ignored_suffixes (tuple, optional): Suffixes of the files which are not counted. Defaults to ().
+
+        Returns:
+            int: The number of files.
+        """
+        with os.scandir(directory) as entries:
+            return sum(1 for entry in entries if not entry.name.endswith(ignored_suffixes))
+
+    def stop(self) -> None:
+        """
+        Stop the watcher.
+        """
+        self.e.set()
+
+    def handle(self, data:bytes) -> bool:
+        """
+        Updates the count with a batch of events.
+
+        Args:
+            data (bytes): The events read from inotify.
+
+        Returns:
+            bool: False if the directory is not watched anymore, True otherwise.
+        """
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = self.event_format.unpack_from(data, offset)
+            offset += self.event_format.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            # Count again after the lost events
+            if mask & self.IN_Q_OVERFLOW:
+                self.count = DirectoryWatcher.count_files(self.directory, self.ignored_suffixes)
+            # The directory is gone
+            elif mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF | self.IN_IGNORED):
+                return False
+            elif name.endswith(self.ignored_suffixes):
+                continue
+            elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self.count += 1
+            elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                self.count -= 1
+        return True
+
+    def run(self) -> None:
+        """
+        Reads the events until the watcher is stopped or the directory is gone.
+        """
+        try:
+            while not self.e.is_set():
+                # Wait for the events
+                ready, _, _ = select.select([self.fd], [], [], self.poll_interval)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(self.fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                if not self.handle(data):
+                    return
+        except (OSError, ValueError):
+            return
+        finally:
+            os.close(self.fd)
@@ -9,10 +9,15 @@
 import os
 
 from classes.checkers.checker import Checker
+from classes.checkers.directory_watcher import DirectoryWatcher
+from classes.http_pool import HTTPPool
 
 class FolderChecker(Checker):
     """
     A class that represents a checker for monitoring a directory.
+
+    The files can be counted at each check, listing the directory or scanning it without building a list,
+    or kept counted by a watcher of the inotify events, which falls back to the counting when inotify is not available.
     """
 
     directory:str = 'pdf/'
@@ -23,8 +28,16 @@ class FolderChecker(Checker):
     """Current number of files in the directory."""
     max_len:int = 0
     """Maximum number of files in the directory."""
-
-    def __init__(self, directory:str, name:str = "Folder Checker", sleep_time:int = 10, url:str = None, send_check:bool = False, max_len:int = 0) -> None:
+    ignored_suffixes:tuple = (".part", ".part.meta")
+    """Suffixes of the files being downloaded, which are not counted."""
+    watch:bool = False
+    """If True, the files are counted from the inotify events of the directory."""
+    counter:str = "listdir"
+    """How the files are counted without the watcher: "listdir" or "scandir", which does not build the list of the names."""
+    watcher:DirectoryWatcher = None
+    """Watcher of the directory, None when the files are counted at each check."""
+
+    def __init__(self, directory:str, name:str = "Folder Checker", sleep_time:int = 10, url:str = None, send_check:bool = False, max_len:int = 0, pool:HTTPPool = None, watch:bool = None, counter:str = None) -> None:
         """
         Costructor
         
@@ -37,11 +50,18 @@ class FolderChecker(Checker):
             url (str, optional): URL to send the check. Defaults to None.
             send_check (bool, optional): Flag indicating if the check should be sent. Defaults to False.
             max_len (int, optional): Maximum number of files in the directory. Defaults
+            pool (HTTPPool, optional): Pool of HTTP connections. Defaults to None.
+            watch (bool, optional): If True, the files are counted from the inotify events. Defaults to None.
+            counter (str, optional): How the files are counted without the watcher: "listdir" or "scandir". Defaults to None.
             
         """
-        super().__init__(name=name, sleep_time=sleep_time, url=url, send_check=send_check)
+        super().__init__(name=name, sleep_time=sleep_time, url=url, send_check=send_check, pool=pool)
         self.directory = directory
         self.max_len = max_len
+        if watch is not None:
+            self.watch = watch
+        if counter in ("listdir", "scandir"):
+            self.counter = counter
     
     def __str__(self) -> str:
         """
@@ -68,14 +88,49 @@ class FolderChecker(Checker):
         Returns:
             int: The current length of the directory.
         """
+        # Take the length kept by the watcher
+        if self.watch and self.start_watcher():
+            self.current_len = self.watcher.count
+            return self.current_len
         try:
-            # Update the current length
-            self.current_len = len(os.listdir(self.directory))
+            # Update the current length without the files being downloaded
+            if self.counter == "scandir":
+                self.current_len = DirectoryWatcher.count_files(self.directory, self.ignored_suffixes)
+            else:
+                self.current_len = len([f for f in os.listdir(self.directory) if not f.endswith(self.ignored_suffixes)])
         except:
             self.current_len = 0
             self.previous_len = 0
         return self.current_len
 
+    def start_watcher(self) -> bool:
+        """
+        Start watching the directory, if it is not watched yet.
+        A directory which does not exist yet is watched at a next check.
+
+        Returns:
+            bool: True if the directory is watched, False otherwise.
+        """
+        if self.watcher is not None and self.watcher.is_alive():
+            return True
+        try:
+            self.watcher = DirectoryWatcher(self.directory, self.ignored_suffixes)
+            self.watcher.start()
+            return True
+        except OSError:
+            self.watcher = None
+            return False
+
+    def run(self) -> None:
+        """
+        Run the checker, then stop the watcher.
+        """
+        try:
+            super().run()
+        finally:
+            if self.watcher is not None:
+                self.watcher.stop()
+
     def get_progresses(self) -> str:
         """
         Returns the progress of the checker as a string.
@@ -6,25 +6,39 @@
     license: European Union Public Licence v. 1.2.  
 '''
 
+import os
+
 from classes.checkers.checker import Checker
+from classes.http_pool import HTTPPool
+from classes.log_rotator import LogRotator
 
 class LogChecker(Checker):
     """
     A class that represents a checker for monitoring the logs.
+
+    The error log is read from the byte offset reached by the previous check,
+    and the last line of the output log is found by reading backwards from its end,
+    so that a check does not depend on the size of the logs.
     """
 
     log_err:str = 'log/error.log'
     """Log file for errors."""
     log_out:str = 'log/output.log'
     """Log file for output."""
-    last_err_line:int = 0
-    """Last line read from the error log."""
+    err_offset:int = 0
+    """Byte offset of the error log read so far, a partial line is read by the next check."""
+    block_size:int = 4096
+    """Size in bytes of the blocks read backwards to find the last line of the output log."""
     progresses:str = ""
     """Progresses of the checker."""
     new_error:bool = False
     """Flag indicating if there are new errors."""
+    err_inode:int = None
+    """Inode of the error log at the last check, a new one means the log was rotated, a smaller size that it was truncated."""
+    last_archive:tuple = None
+    """Inode and modification time of the newest archive of the error log at the last check, a new one means the log was rotated."""
 
-    def __init__(self, log_err:str, log_out:str = None, name: str = "Log Checker", sleep_time: int = 10, url: str = None, send_check: bool = False) -> None:
+    def __init__(self, log_err:str, log_out:str = None, name: str = "Log Checker", sleep_time: int = 10, url: str = None, send_check: bool = False, pool: HTTPPool = None) -> None:
         """
         Costructor
 
@@ -37,8 +51,9 @@ class LogChecker(Checker):
             sleep_time (int, optional): Time to wait before checking again. Defaults to 10.
             url (str, optional): URL to send the check. Defaults to None.
             send_check (bool, optional): Flag indicating if the check should be sent. Defaults to False
+            pool (HTTPPool, optional): Pool of HTTP connections. Defaults to None.
         """
-        super().__init__(name, sleep_time, url, send_check)
+        super().__init__(name, sleep_time, url, send_check, pool)
         self.log_err = log_err
         self.log_out = log_out
 
@@ -71,15 +86,50 @@ class LogChecker(Checker):
         if self.log_out is None:
             return "OK"
         # Get the last line of the output log
-        with open(self.log_out, 'r') as file:
-            lines = file.readlines()
-            last_line = lines[-1].strip() if lines else ""
-            file.close()
+        last_line = self.last_line(self.log_out)
+        # A log just rotated is empty, its last line is in the newest archive
+        if last_line == "" and LogRotator.archives(self.log_out):
+            with LogRotator.locked(self.log_out):
+                archives = LogRotator.archives(self.log_out)
+                if archives:
+                    with LogRotator.open_archive(archives[0]) as file:
+                        for line in file:
+                            last_line = line
+            last_line = last_line.strip()
         # Update the progresses
         self.progresses = last_line
         # Return the last line
         return self.progresses
     
+    def last_line(self, path:str) -> str:
+        """
+        Get the last line of a log, reading blocks backwards from its end.
+
+        Args:
+            path (str): Path to the log.
+
+        Returns:
+            str: The last line which is not empty, or an empty string if the log is empty or does not exist.
+        """
+        try:
+            file = open(path, 'rb')
+        except FileNotFoundError:
+            return ""
+        with file:
+            tail = b""
+            pos = file.seek(0, os.SEEK_END)
+            while pos > 0:
+                # Read the previous block
+                step = min(self.block_size, pos)
+                pos -= step
+                file.seek(pos)
+                tail = file.read(step) + tail
+                # The last line starts after the last newline which does not end the file
+                start = tail.rstrip(b"\r\n").rfind(b"\n")
+                if start >= 0:
+                    return tail[start + 1:].decode(errors="replace").strip()
+            return tail.decode(errors="replace").strip()
+
     def check(self) -> bool:
         """
         Check the log files for new errors.
@@ -91,24 +141,121 @@ class LogChecker(Checker):
         self.new_error = False
         self.progresses = ""
         success = True
-        # Open error file
-        with open(self.log_err, 'r') as file:
-            # Read the lines
-            lines = file.readlines()
-            # Check if there are new errors
-            if len(lines) > self.last_err_line:
-                # Set the flag 
-                self.new_error = True
-                # Read the errors
-                for line in lines[self.last_err_line:]:
-                    # Update the progresses
-                    self.progresses += line + "\n"
-                    # If the word is not in line the check is failed
-                    if "not downloaded" not in line:
-                        success = False
-                # Update the last line read
-                self.last_err_line = len(lines)
-            # Close the file
-            file.close()
+        stat = self.stat_log()
+        if stat is None:
+            return success
+        archives = LogRotator.archives(self.log_err)
+        # The inode of the log can be reused by the rotations, the newest archive tells them apart
+        if self.err_inode is not None and (stat.st_ino != self.err_inode or LogChecker.stamp(archives) != self.last_archive):
+            with LogRotator.locked(self.log_err):
+                # List again, a rotation could have been running
+                stat = self.stat_log()
+                if stat is None:
+                    return success
+                archives = LogRotator.archives(self.log_err)
+                # Read the errors written before the rotations since the last check, the oldest archive first
+                for archive in reversed(self.new_archives(archives)):
+                    with LogRotator.open_archive(archive, binary=True) as file:
+                        file.seek(self.err_offset)
+                        success = self.check_tail(file) and success
+                    self.err_offset = 0
+            # A log rotated without archives is read from the start
+            if stat.st_ino != self.err_inode:
+                self.err_offset = 0
+        # Read a truncated log from the start
+        elif stat.st_size < self.err_offset:
+            self.err_offset = 0
+        self.err_inode = stat.st_ino
+        self.last_archive = LogChecker.stamp(archives)
+        # Read the new errors
+        if stat.st_size > self.err_offset:
+            try:
+                with open(self.log_err, 'rb') as file:
+                    # A log replaced since its status is read by the next check, with the archives
+                    if os.fstat(file.fileno()).st_ino == stat.st_ino:
+                        file.seek(self.err_offset)
+                        success = self.check_tail(file) and success
+            except FileNotFoundError:
+                pass
         # Return the result
         return success
+
+    def stat_log(self) -> os.stat_result:
+        """
+        Get the status of the error log.
+
+        Returns:
+            os.stat_result: The status of the error log, or None if it does not exist, for instance before the first error.
+        """
+        try:
+            return os.stat(self.log_err)
+        except FileNotFoundError:
+            return None
+
+    def new_archives(self, archives:list) -> list:
+        """
+        Get the archives made after the last check.
+
+        Args:
+            archives (list[str]): Paths to the archives of the error log, the newest first.
+
+        Returns:
+            list[str]: Paths to the new archives, the newest first.
+        """
+        new = []
+        for archive in archives:
+            stamp = LogChecker.stamp([archive])
+            # Stop at the newest archive of the last check, or at an older one if it was deleted
+            if self.last_archive is not None and (stamp == self.last_archive or stamp[1] < self.last_archive[1]):
+                break
+            new.append(archive)
+        return new
+
+    @staticmethod
+    def stamp(archives:list) -> tuple:
+        """
+        Get the inode and the modification time of the newest archive, which are kept when the archives are shifted.
+
+        Args:
+            archives (list[str]): Paths to the archives of the error log, the newest first.
+
+        Returns:
+            tuple: Inode and modification time in nanoseconds, or None if there are no archives.
+        """
+        if not archives:
+            return None
+        try:
+            stat = os.stat(archives[0])
+        except FileNotFoundError:
+            # Shifted by a rotation, the next check reads it under the lock
+            return None
+        return (stat.st_ino, stat.st_mtime_ns)
+
+    def check_tail(self, file) -> bool:
+        """
+        Check the complete lines of the error log from the current position, and advance the offset past them.
+
+        Args:
+            file (BinaryIO): The error log, or one of its archives, open at the offset.
+
+        Returns:
+            bool: True if there are no errors, False otherwise
+        """
+        success = True
+        errors = []
+        for line in file:
+            # Leave a partial line to the next check
+            if not line.endswith(b"\n"):
+                break
+            self.err_offset += len(line)
+            line = line.decode(errors="replace")
+            # Set the flag
+            self.new_error = True
+            # Collect the progresses
+            errors.append(line + "\n")
+            # If the word is not in line the check is failed
+            if "not downloaded" not in line:
+                success = False
+        # Update the progresses
+        self.progresses += "".join(errors)
+        return success
@@ -0,0 +1,123 @@
+#!/bin/python3
+'''
+    BloomFilter  
+    file name: bloom_filter.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import math
+import hashlib
+
+
+class BloomFilter:
+    """
+    BloomFilter class.
+
+    A set of strings in a fixed amount of memory, sized from the expected number of keys and the false positive rate.
+    A key which was added is always found, a key which was not added is found with the false positive rate.
+    """
+    capacity:int = 10000000
+    """Expected number of keys"""
+    error_rate:float = 0.001
+    """False positive rate when the filter holds capacity keys"""
+    size:int = 0
+    """Number of bits"""
+    hashes:int = 0
+    """Number of bits set for each key"""
+    bits:bytearray = None
+    """Bits of the filter"""
+    count:int = 0
+    """Number of keys added"""
+
+    def __init__(self, capacity:int = None, error_rate:float = None) -> None:
+        """
+        Initializes a BloomFilter object.
+
+        Args:
+            capacity (int, optional): Expected number of keys. Defaults to None.
+            error_rate (float, optional): False positive rate when the filter holds capacity keys. Defaults to None.
+        """
+        if capacity is not None and capacity > 0:
+            self.capacity = capacity
+        if error_rate is not None and 0 < error_rate < 1:
+            self.error_rate = error_rate
+        # Optimal number of bits and of hashes
+        self.size = max(8, math.ceil(-self.capacity * math.log(self.error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the BloomFilter object.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"capacity: {self.capacity}, error rate: {self.error_rate}, bits: {self.size}, hashes: {self.hashes}, keys: {self.count}"
+
+    def __len__(self) -> int:
+        """
+        Returns the number of keys added.
+
+        Returns:
+            int: Number of keys added.
+        """
+        return self.count
+
+    def __contains__(self, key:str) -> bool:
+        """
+        Checks if a key may have been added.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            bool: False if the key was not added, True if it was probably added.
+        """
+        bits = self.bits
+        return all(bits[i >> 3] & (1 << (i & 7)) for i in self.positions(key))
+
+    def positions(self, key:str) -> list[int]:
+        """
+        Computes the bits of a key by double hashing one 128 bits digest.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            list[int]: The positions of the bits of the key.
+        """
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key:str) -> bool:
+        """
+        Adds a key.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            bool: True if the key was probably added before, False if it is new.
+        """
+        bits = self.bits
+        found = True
+        for i in self.positions(key):
+            mask = 1 << (i & 7)
+            if not bits[i >> 3] & mask:
+                bits[i >> 3] |= mask
+                found = False
+        if not found:
+            self.count += 1
+        return found
+
+    def clear(self) -> None:
+        """
+        Removes all the keys.
+        """
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
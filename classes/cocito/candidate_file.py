@@ -0,0 +1,218 @@
+#!/bin/python3
+'''
+    CandidateFile  
+    file name: candidate_file.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import zlib
+import itertools
+
+from classes.log_manager import LogManager
+from classes.cocito.download_candidate import DownloadCandidate
+from classes.cocito.links_index import LinksIndex
+from classes.cocito.deduplicator import Deduplicator
+
+class CandidateFile:
+    """
+    A class which reads the download candidates from a CSV file while they are downloaded.
+
+    The candidates are parsed in blocks of lines, so the download starts after the first block
+    and the whole file is never held in memory.
+    """
+    path: str
+    """Path of the file."""
+    start: int = 0
+    """First line to read."""
+    end: int = -1
+    """Line after the last one to read, -1 to read until the end of the file."""
+    errors: int = 0
+    """Number of lines not parsed, counted by the first shard only."""
+    output: LogManager = LogManager()
+    """Log Manager for logging."""
+    read_size: int = 1 << 20
+    """Size in bytes of the blocks read to count the lines."""
+    block_lines: int = 1024
+    """Number of lines parsed at once."""
+    report_errors: int = 10
+    """Number of lines not parsed shown in the import error message."""
+    indexed: bool = False
+    """If True, the lines are reached through a LinksIndex instead of reading the previous ones."""
+    index: LinksIndex = None
+    """Index of the line offsets, when indexed is set."""
+    dedup: Deduplicator = None
+    """Deduplicator dropping the candidates already read, None to keep them all."""
+    shard: int = 0
+    """Index of the shard to read when the candidates are split by the hash of their file name."""
+    shards: int = 1
+    """Number of shards, 1 to read all the candidates."""
+    skip: set = None
+    """Numbers of the lines dropped without being parsed, for instance the duplicates found by a sharded download."""
+    on_drop = None
+    """Called with the number of lines of a block which give no candidate, the duplicates, the lines not parsed and the skipped ones, so that the progress counts them."""
+
+    def __init__(self, path: str, start: int = 0, end: int = -1, output: LogManager = None, indexed: bool = False, dedup: Deduplicator = None, shard: int = 0, shards: int = 1, skip: set = None, on_drop = None) -> None:
+        """
+        Constructor
+
+        Initializes an instance of CandidateFile.
+
+        Args:
+            path (str): Path of the file.
+            start (int, optional): First line to read. Defaults to 0.
+            end (int, optional): Line after the last one to read, -1 to read until the end of the file. Defaults to -1.
+            output (LogManager, optional): LogManager instance for logging. Defaults to None.
+            indexed (bool, optional): If True, reach the lines through a LinksIndex. Defaults to False.
+            dedup (Deduplicator, optional): Deduplicator dropping the candidates already read. Defaults to None.
+            shard (int, optional): Index of the shard to read when the candidates are split by the hash of their file name. Defaults to 0.
+            shards (int, optional): Number of shards, 1 to read all the candidates. Defaults to 1.
+            skip (set, optional): Numbers of the lines dropped without being parsed. Defaults to None.
+            on_drop (Callable[[int], None], optional): Called with the number of lines of a block which give no candidate. Defaults to None.
+        """
+        self.path = path
+        self.start = max(start, 0)
+        self.end = end
+        if output is not None:
+            self.output = output
+        self.indexed = indexed
+        self.dedup = dedup
+        self.shard = shard
+        self.shards = max(shards, 1)
+        self.skip = skip
+        if on_drop is not None:
+            self.on_drop = on_drop
+
+    def get_index(self) -> LinksIndex:
+        """
+        Loads or builds the index of the file the first time it is needed.
+
+        Returns:
+            LinksIndex: The index of the line offsets.
+        """
+        if self.index is None:
+            self.index = LinksIndex(self.path)
+        return self.index
+
+    def __str__(self) -> str:
+        return "File: " + self.path + "\nStart: " + str(self.start) + "\nEnd: " + str(self.end)
+
+    def __iter__(self):
+        """
+        Reads the candidates of the file from start to end.
+        The lines before start are skipped without being parsed, the lines not parsed are reported once at the end.
+
+        Yields:
+            DownloadCandidate: The next candidate.
+
+        Raises:
+            OSError: If the file can not be opened.
+        """
+        self.errors = 0
+        # First lines not parsed
+        first: list[str] = []
+        self.output.print_out("Importing file: " + self.path)
+        lines = self.read_lines()
+        # Number of the first line of the block
+        n = self.start
+        while True:
+            # Parse the next block of lines
+            block = list(itertools.islice(lines, self.block_lines))
+            if not block:
+                break
+            # Drop the skipped lines
+            dropped = len(block)
+            if self.skip:
+                block = [line for i, line in enumerate(block, n) if i not in self.skip]
+            dropped -= len(block)
+            n += self.block_lines
+            bad: list[str] = []
+            candidates: list[DownloadCandidate] = []
+            for candidate in DownloadCandidate.make_candidates(block, bad):
+                # Skip the candidates of the other shards
+                if self.shards > 1 and CandidateFile.shard_of(candidate, self.shards) != self.shard:
+                    continue
+                if self.dedup is None or not self.dedup.is_duplicate(candidate):
+                    candidates.append(candidate)
+                else:
+                    dropped += 1
+            # The lines not parsed have no file name, the first shard counts them for all the shards
+            if self.shard == 0:
+                # Keep the first lines not parsed
+                self.errors += len(bad)
+                first.extend(bad[:self.report_errors - len(first)])
+                dropped += len(bad)
+            # Count the lines which give no candidate before the downloads of the block
+            if self.on_drop is not None and dropped > 0:
+                self.on_drop(dropped)
+            yield from candidates
+        # Report the lines not parsed once
+        if self.errors > 0:
+            self.output.print_err("Error: " + str(self.errors) + " lines not parsed, first:\t" + "\t".join(first))
+        # ACK message
+        self.output.print_out("File imported")
+
+    @staticmethod
+    def shard_of(candidate: DownloadCandidate, shards: int) -> int:
+        """
+        Finds the shard of a candidate by the hash of its file name,
+        so that the candidates writing the same file are always downloaded by the same process.
+
+        Args:
+            candidate (DownloadCandidate): The candidate.
+            shards (int): Number of shards.
+
+        Returns:
+            int: The index of the shard.
+        """
+        return zlib.crc32(candidate.name.encode()) % shards
+
+    def read_lines(self):
+        """
+        Reads the lines from start to end.
+
+        Yields:
+            str: The next line.
+        """
+        # Jump to the first line
+        if self.indexed:
+            yield from self.get_index().read(self.start, self.end)
+            return
+        with open(self.path, 'r') as f:
+            # Skip the lines out of the range
+            yield from itertools.islice(f, self.start, self.end if self.end >= 0 else None)
+
+    def __len__(self) -> int:
+        """
+        Counts the lines between start and end, end is clamped to the lines of the file.
+        The lines of all the shards are counted.
+
+        Returns:
+            int: The number of lines to read.
+        """
+        lines = len(self.get_index()) if self.indexed else self.count_lines()
+        if self.end >= 0:
+            lines = min(lines, self.end)
+        return max(lines - self.start, 0)
+
+    def count_lines(self) -> int:
+        """
+        Counts the lines of the file reading it in binary blocks, without decoding them.
+
+        Returns:
+            int: The number of lines of the file, 0 if it can not be read.
+        """
+        lines = 0
+        last = b"\n"
+        try:
+            with open(self.path, 'rb') as f:
+                # Read the file block by block
+                for block in iter(lambda: f.read(self.read_size), b""):
+                    lines += block.count(b"\n")
+                    last = block[-1:]
+        except OSError:
+            return 0
+        # Count the last line without newline
+        if last != b"\n":
+            lines += 1
+        return lines
@@ -0,0 +1,128 @@
+#!/bin/python3
+'''
+    Deduplicator  
+    file name: deduplicator.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+from classes.cocito.bloom_filter import BloomFilter
+
+
+class Deduplicator:
+    """
+    Deduplicator class.
+
+    It drops the download candidates whose URL or whose file name was already imported,
+    so that the same document is not requested twice and no file is overwritten.
+    The keys are kept in exact sets or, for very large files, in Bloom filters of fixed size
+    which can also drop a few unique candidates with the false positive rate.
+    """
+    EXACT:str = "exact"
+    """Mode keeping the keys in sets"""
+    BLOOM:str = "bloom"
+    """Mode keeping the keys in Bloom filters"""
+    mode:str = EXACT
+    """Mode of the deduplicator"""
+    capacity:int = 10000000
+    """Expected number of candidates in the bloom mode"""
+    error_rate:float = 0.001
+    """False positive rate of the bloom mode"""
+    urls = None
+    """URLs already imported"""
+    names = None
+    """File names already imported"""
+    duplicate_urls:int = 0
+    """Number of candidates dropped for their URL"""
+    duplicate_names:int = 0
+    """Number of candidates dropped for their file name"""
+
+    def __init__(self, mode:str = None, capacity:int = None, error_rate:float = None) -> None:
+        """
+        Initializes a Deduplicator object.
+
+        Args:
+            mode (str, optional): "exact" to keep the keys in sets, "bloom" to keep them in Bloom filters. Defaults to None.
+            capacity (int, optional): Expected number of candidates in the bloom mode. Defaults to None.
+            error_rate (float, optional): False positive rate of the bloom mode. Defaults to None.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        if mode is not None:
+            if mode not in (self.EXACT, self.BLOOM):
+                raise ValueError("Unknown deduplication mode: " + mode)
+            self.mode = mode
+        if capacity is not None and capacity > 0:
+            self.capacity = capacity
+        if error_rate is not None and 0 < error_rate < 1:
+            self.error_rate = error_rate
+        self.clear()
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the Deduplicator object.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"mode: {self.mode}, duplicate urls: {self.duplicate_urls}, duplicate names: {self.duplicate_names}"
+
+    def __len__(self) -> int:
+        """
+        Returns the number of candidates dropped.
+
+        Returns:
+            int: Number of candidates dropped.
+        """
+        return self.duplicate_urls + self.duplicate_names
+
+    def clear(self) -> None:
+        """
+        Forgets the imported candidates and resets the counters.
+        """
+        if self.mode == self.BLOOM:
+            self.urls = BloomFilter(self.capacity, self.error_rate)
+            self.names = BloomFilter(self.capacity, self.error_rate)
+        else:
+            self.urls = set()
+            self.names = set()
+        self.duplicate_urls = 0
+        self.duplicate_names = 0
+
+    def is_duplicate(self, candidate) -> bool:
+        """
+        Checks if a candidate was already imported and remembers it otherwise.
+
+        Args:
+            candidate (DownloadCandidate): The candidate.
+
+        Returns:
+            bool: True if its URL or its file name was already imported, False otherwise.
+        """
+        # Check the URL
+        if candidate.url in self.urls:
+            self.duplicate_urls += 1
+            return True
+        # Check the file name
+        if candidate.name in self.names:
+            self.duplicate_names += 1
+            return True
+        self.urls.add(candidate.url)
+        self.names.add(candidate.name)
+        return False
+
+    def filter(self, candidates):
+        """
+        Drops the duplicate candidates.
+
+        Args:
+            candidates (Iterable[DownloadCandidate]): The candidates.
+
+        Yields:
+            DownloadCandidate: The next candidate not imported yet.
+        """
+        is_duplicate = self.is_duplicate
+        for candidate in candidates:
+            if not is_duplicate(candidate):
+                yield candidate
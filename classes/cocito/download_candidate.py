@@ -0,0 +1,118 @@
+#!/bin/python3
+'''
+    DownloadCandidate  
+    file name: download_candidate.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+from classes.log_manager import LogManager
+
+class DownloadCandidate:
+    """
+    A class representing a download candidate with a URL and a filename.
+
+    The candidates have no instance dictionary and the filename is made on demand,
+    so that millions of them can be held in memory.
+    """
+    __slots__ = ("url", "name")
+    url: str
+    """The URL of the file."""
+    name: str
+    """The name of the file."""
+
+    def __init__(self, url: str, filename: str) -> None:
+        """
+        Constructor
+        
+        Initializes an instance of DownloadCandidate.
+
+        Args:
+            url (str): The URL of the file.
+            filename (str): The name of the file.
+
+        Returns:
+            None
+        """
+        self.url = url
+        self.name = filename
+
+    @property
+    def filename(self) -> str:
+        """The filename of the file."""
+        return self.name + ".pdf"
+
+    @staticmethod    
+    def make_candidate(line: str) -> "DownloadCandidate":
+        """
+        Create a DownloadCandidate object based on the given line.
+
+        Args:
+            line (str): The input line containing the name and URL separated by a comma.
+
+        Returns:
+            DownloadCandidate: The created DownloadCandidate object.
+
+        Raises:
+            None
+
+        """
+        # Initialize the candidate
+        candite: DownloadCandidate = None
+        # Initialize the Log Manager
+        log = LogManager()
+        try:
+            # Remove the newline character
+            line = line.strip()
+            # Split the line
+            name = line.split(",")[0]
+            url = line.split(",")[1]
+            # Check if the name and URL are not empty
+            if name != "" and url != "":
+                # Create the candidate
+                candite = DownloadCandidate(url, name)
+            else:
+                log.print_err("Error line non parsed:\t" + line)
+        except:
+            log.print_err("Error line:\t" + line)
+        # Return the candidate
+        return candite
+    
+    @staticmethod
+    def make_candidates(lines: list[str], errors: list[str] = None) -> list["DownloadCandidate"]:
+        """
+        Create the DownloadCandidate objects of many lines at once.
+        The lines are parsed as in make_candidate, but the lines not parsed are collected instead of being logged one by one.
+
+        Args:
+            lines (list[str]): The input lines containing the name and URL separated by a comma.
+            errors (list[str], optional): The list where the lines not parsed are appended. Defaults to None.
+
+        Returns:
+            list[DownloadCandidate]: The created DownloadCandidate objects.
+        """
+        candidates = []
+        # Bind the methods once for the whole block
+        append = candidates.append
+        bad = errors.append if errors is not None else None
+        for line in lines:
+            # Split only the first two fields
+            fields = line.strip().split(",", 2)
+            if len(fields) > 1 and fields[0] != "" and fields[1] != "":
+                append(DownloadCandidate(fields[1], fields[0]))
+            elif bad is not None:
+                bad(line.strip())
+        return candidates
+
+    def print_candidate(self) -> str:
+            """
+            Returns a string representation of the candidate's name and URL.
+            It works for CSV format.
+
+            Returns:
+                A string in the format "<name>,<url>" representing the candidate's name and URL.
+            """
+            return self.name + "," + self.url
+
+    def __str__(self) -> str:
+        return "Name: " + self.name + "\nFilename: " + self.filename + "\nURL: " + self.url
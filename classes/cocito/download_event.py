@@ -0,0 +1,116 @@
+#!/bin/python3
+'''
+    DownloadEvent  
+    file name: download_event.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import sys
+import time
+from contextlib import contextmanager
+import requests
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from classes.cocito.download_candidate import DownloadCandidate
+
+class DownloadEvent:
+    """
+    A class recording the download of a candidate, which is written as a JSON line to the event log.
+
+    The events have no instance dictionary, like the candidates, since one is made for each download.
+    """
+    __slots__ = ("downloader", "name", "url", "link", "cached", "status", "bytes", "resolve_time", "fetch_time", "attempts", "outcome", "error", "time")
+    downloader: str
+    """The name of the downloader."""
+    name: str
+    """The name of the candidate."""
+    url: str
+    """The URL of the candidate."""
+    link: str
+    """The resolved link to the PDF."""
+    cached: bool
+    """True if the link came from the resolution cache."""
+    status: int
+    """The status code of the last response."""
+    bytes: int
+    """The number of bytes written."""
+    resolve_time: float
+    """Seconds spent finding the link, the retries included."""
+    fetch_time: float
+    """Seconds spent downloading the PDF, the retries included."""
+    attempts: int
+    """The number of attempts, 1 plus the retries of the steps."""
+    outcome: str
+    """The outcome: "downloaded", "requeued" or "failed"."""
+    error: str
+    """The type of the error which failed the download."""
+    time: float
+    """The time when the download started, as a timestamp."""
+
+    def __init__(self, candidate: DownloadCandidate, downloader: str = None) -> None:
+        """
+        Constructor
+
+        Initializes an instance of DownloadEvent when the download of a candidate starts.
+
+        Args:
+            candidate (DownloadCandidate): The candidate being downloaded.
+            downloader (str, optional): The name of the downloader. Defaults to None.
+        """
+        self.downloader = downloader
+        self.name = candidate.name
+        self.url = candidate.url
+        self.link = None
+        self.cached = False
+        self.status = None
+        self.bytes = 0
+        self.resolve_time = None
+        self.fetch_time = None
+        self.attempts = 1
+        self.outcome = None
+        self.error = None
+        self.time = time.time()
+
+    @contextmanager
+    def timing(self, step: str):
+        """
+        Measures a step of the download, even if it fails.
+
+        Args:
+            step (str): The attribute storing the seconds, "resolve_time" or "fetch_time".
+        """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            setattr(self, step, round(time.perf_counter() - start, 6))
+
+    def fail(self) -> "DownloadEvent":
+        """
+        Records the error being handled, with its status code if it is an HTTP error.
+
+        Returns:
+            DownloadEvent: This event.
+        """
+        error = sys.exc_info()[1]
+        if error is None:
+            return self
+        self.error = type(error).__name__
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            self.status = error.response.status_code
+        elif aiohttp is not None and isinstance(error, aiohttp.ClientResponseError):
+            self.status = error.status
+        return self
+
+    def to_dict(self) -> dict:
+        """
+        Returns the fields of the event.
+
+        Returns:
+            dict: The fields, ready to be written as JSON.
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
@@ -7,88 +7,30 @@
 '''
 
 import os
+import re
+import time
+import itertools
+import queue
+import asyncio
 import threading
-import requests
+from typing import BinaryIO
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
 from classes.log_manager import LogManager
-
-class DownloadCandidate:
-    """
-    A class representing a download candidate with a URL and a filename.
-    """
-    url: str
-    """The URL of the file."""
-    name: str
-    """The name of the file."""
-    filename: str
-    """The filename of the file."""
-
-    def __init__(self, url: str, filename: str) -> None:
-        """
-        Constructor
-        
-        Initializes an instance of DownloadCandidate.
-
-        Args:
-            url (str): The URL of the file.
-            filename (str): The name of the file.
-
-        Returns:
-            None
-        """
-        self.url = url
-        self.name = filename
-        self.filename = filename + ".pdf"
-
-    @staticmethod    
-    def make_candidate(line: str) -> "DownloadCandidate":
-        """
-        Create a DownloadCandidate object based on the given line.
-
-        Args:
-            line (str): The input line containing the name and URL separated by a comma.
-
-        Returns:
-            DownloadCandidate: The created DownloadCandidate object.
-
-        Raises:
-            None
-
-        """
-        # Initialize the candidate
-        candite: DownloadCandidate = None
-        # Initialize the Log Manager
-        log = LogManager()
-        try:
-            # Remove the newline character
-            line = line.strip()
-            # Split the line
-            name = line.split(",")[0]
-            url = line.split(",")[1]
-            # Check if the name and URL are not empty
-            if name != "" and url != "":
-                # Create the candidate
-                candite = DownloadCandidate(url, name)
-            else:
-                log.print_err("Error line non parsed:\t" + line)
-        except:
-            log.print_err("Error line:\t" + line)
-        # Return the candidate
-        return candite
-    
-    def print_candidate(self) -> str:
-            """
-            Returns a string representation of the candidate's name and URL.
-            It works for CSV format.
-
-            Returns:
-                A string in the format "<name>,<url>" representing the candidate's name and URL.
-            """
-            return self.name + "," + self.url
-
-    def __str__(self) -> str:
-        return "Name: " + self.name + "\nFilename: " + self.filename + "\nURL: " + self.url
+from classes.http_pool import HTTPPool
+from classes.retry_policy import RetryPolicy
+from classes.cocito.download_candidate import DownloadCandidate
+from classes.cocito.download_event import DownloadEvent
+from classes.cocito.candidate_file import CandidateFile
+from classes.cocito.work_queue import WorkQueue
+from classes.cocito.journal import Journal
+from classes.cocito.resolution_cache import ResolutionCache
+from classes.cocito.deduplicator import Deduplicator
 
 class EUgolino(threading.Thread):
     """
@@ -113,12 +55,78 @@ class EUgolino(threading.Thread):
     """Current download candidate."""
     downloaded: int = 0
     """Number of downloaded files."""
+    skipped: int = 0
+    """Number of candidates skipped because already downloaded."""
     not_downloaded_files:str = "not_downloaded.txt"
     """File to store the list of files that were not downloaded."""
     output:LogManager = LogManager()
     """Log Manager for logging."""
+    pool:HTTPPool = HTTPPool()
+    """Pool of HTTP connections."""
+    chunk_size: int = 64 * 1024
+    """Size in bytes of the chunks written to disk."""
+    part_suffix: str = ".part"
+    """Suffix of the files being downloaded."""
+    meta_suffix: str = ".meta"
+    """Suffix appended to a partial file to store its ETag or Last-Modified validator."""
+    workers: int = 1
+    """Number of parallel downloads."""
+    resolvers: int = 0
+    """Number of workers resolving the landing pages for the downloading workers, 0 to resolve and download in the same worker."""
+    queue_size: int = 100
+    """Maximum number of resolved links waiting for a downloading worker."""
+    total: int = 0
+    """Number of candidates to process in the current download."""
+    progress: int = 0
+    """Number of candidates processed in the current download."""
+    progress_counter = None
+    """Counter of the processed candidates shared by the processes of a sharded download (multiprocessing.Value), None to count in this instance only."""
+    progress_total: int = -1
+    """Number of candidates shown in the progress of a sharded download, -1 to show the candidates of this instance."""
+    lock: threading.Lock = None
+    """Lock protecting the counters and the files shared by the workers."""
+    budget: threading.Semaphore = None
+    """Semaphore shared with the other downloaders running at the same time, limiting their requests in flight, None for no limit."""
+    budget_turn: asyncio.Lock = None
+    """Lock of the asyncio backend letting one download at a time wait for a slot of the budget in a thread."""
+    stopping: threading.Event = None
+    """Event set to stop taking new candidates."""
+    retry: RetryPolicy = None
+    """Policy repeating the steps of a download which fail for a transient reason, None for a single attempt."""
+    backend: str = "thread"
+    """Download backend: "thread" or "asyncio"."""
+    async_limit: int = 1000
+    """Maximum number of in-flight downloads of the asyncio backend."""
+    async_limit_per_host: int = 100
+    """Maximum number of connections per host of the asyncio backend."""
+    stream_import: bool = False
+    """If True, do_all reads the candidates from the input file while downloading them."""
+    read_size: int = 1 << 20
+    """Number of characters of the blocks read by import_file."""
+    report_errors: int = 10
+    """Number of lines not parsed shown in the import error message."""
+    dedup: Deduplicator = None
+    """Deduplicator dropping the candidates with a URL or a file name already imported, None to keep them all."""
+    links_index: bool = False
+    """If True, the streamed input file is reached through a sidecar index of its line offsets."""
+    requeues: int = 0
+    """Number of times a failed candidate is queued again in the same download."""
+    queue: WorkQueue = None
+    """Queue of the current download."""
+    journal: Journal = None
+    """Journal of the completed downloads."""
+    skip_existing: bool = False
+    """If True, the candidates whose file is already in the destination folder are skipped."""
+    existing: set = None
+    """Names of the files in the destination folder, when skip_existing is set."""
+    script_pattern: re.Pattern = re.compile(r"<script\b[^>]*>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+    """Pattern matching the content of the script tags of a landing page."""
+    fallbacks: int = 0
+    """Number of landing pages resolved by BeautifulSoup."""
+    cache: ResolutionCache = None
+    """Cache of the PDF links found in the landing pages."""
 
-    def __init__(self, file_in: str, candidates: list[DownloadCandidate] = None, max_downloads: int = None, starting_point: int = 0, destination: str = None, not_downloaded_file: str = None, output: LogManager = None, name: str = "EUgolino") -> None:
+    def __init__(self, file_in: str, candidates: list[DownloadCandidate] = None, max_downloads: int = None, starting_point: int = 0, destination: str = None, not_downloaded_file: str = None, output: LogManager = None, name: str = "EUgolino", pool: HTTPPool = None, chunk_size: int = None, workers: int = None, resolvers: int = None, queue_size: int = None, backend: str = None, async_limit: int = None, async_limit_per_host: int = None, journal_file: str = None, skip_existing: bool = None, cache: ResolutionCache = None, stream_import: bool = None, links_index: bool = None, requeues: int = None, dedup: Deduplicator = None, retry: RetryPolicy = None) -> None:
         """
         Initializes an instance of the EUgolino class.
 
@@ -130,10 +138,27 @@ class EUgolino(threading.Thread):
             destination (str, optional): Destination directory for downloaded files. Defaults to None.
             not_downloaded_file (str, optional): File to store the list of files that were not downloaded. Defaults to None.
             output (LogManager, optional): LogManager instance for logging. Defaults to None.
+            name (str, optional): Name of the thread. Defaults to "EUgolino".
+            pool (HTTPPool, optional): Pool of HTTP connections. Defaults to None.
+            chunk_size (int, optional): Size in bytes of the chunks written to disk. Defaults to None.
+            workers (int, optional): Number of parallel downloads. Defaults to None.
+            resolvers (int, optional): Number of workers resolving the landing pages for the downloading workers. Defaults to None.
+            queue_size (int, optional): Maximum number of resolved links waiting for a downloading worker. Defaults to None.
+            backend (str, optional): Download backend, "thread" or "asyncio". Defaults to None.
+            async_limit (int, optional): Maximum number of in-flight downloads of the asyncio backend. Defaults to None.
+            async_limit_per_host (int, optional): Maximum number of connections per host of the asyncio backend. Defaults to None.
+            journal_file (str, optional): File recording the completed downloads, which are skipped by the next runs. Defaults to None.
+            skip_existing (bool, optional): If True, skip the candidates whose file is already in the destination folder. Defaults to None.
+            cache (ResolutionCache, optional): Cache of the PDF links found in the landing pages. Defaults to None.
+            stream_import (bool, optional): If True, do_all reads the candidates from the input file while downloading them. Defaults to None.
+            links_index (bool, optional): If True, reach the streamed input file through a sidecar index of its line offsets. Defaults to None.
+            dedup (Deduplicator, optional): Deduplicator dropping the candidates with a URL or a file name already imported. Defaults to None.
+            requeues (int, optional): Number of times a failed candidate is queued again in the same download. Defaults to None.
+            retry (RetryPolicy, optional): Policy repeating the steps of a download which fail for a transient reason. Defaults to None.
         """
         self.file_in = file_in
-        if candidates is not None:
-            self.candidates = candidates
+        # Each instance owns its list of candidates
+        self.candidates = candidates if candidates is not None else []
         if max_downloads is not None:
             self.max_downloads = max_downloads
         if destination is not None:
@@ -142,6 +167,40 @@ class EUgolino(threading.Thread):
             self.not_downloaded_files = not_downloaded_file
         if output is not None:
             self.output = output
+        if pool is not None:
+            self.pool = pool
+        if chunk_size is not None and chunk_size > 0:
+            self.chunk_size = chunk_size
+        if workers is not None and workers > 0:
+            self.workers = workers
+        if resolvers is not None and resolvers >= 0:
+            self.resolvers = resolvers
+        if queue_size is not None and queue_size > 0:
+            self.queue_size = queue_size
+        if backend is not None:
+            self.backend = backend
+        if async_limit is not None and async_limit > 0:
+            self.async_limit = async_limit
+        if async_limit_per_host is not None and async_limit_per_host >= 0:
+            self.async_limit_per_host = async_limit_per_host
+        if journal_file is not None and journal_file != "":
+            self.journal = Journal(journal_file)
+        if skip_existing is not None:
+            self.skip_existing = skip_existing
+        if cache is not None:
+            self.cache = cache
+        if stream_import is not None:
+            self.stream_import = stream_import
+        if links_index is not None:
+            self.links_index = links_index
+        if dedup is not None:
+            self.dedup = dedup
+        if retry is not None:
+            self.retry = retry
+        if requeues is not None and requeues >= 0:
+            self.requeues = requeues
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
         if self.max_downloads < 0 or starting_point < self.max_downloads:
             self.starting_point = starting_point
         threading.Thread.__init__(self, name=name)
@@ -167,28 +226,28 @@ class EUgolino(threading.Thread):
             self.file_in = file
         if candites is not None:
             self.candidates = candites
-        # Initialize the errors counter
-        errors = 0
-        # Initialize the candidate
-        candite: DownloadCandidate = None
+        # Initialize the lines not parsed
+        bad: list[str] = []
         try:
             # Open the file
             with open(self.file_in, 'r') as f:
-                # Read the file line by line
                 self.output.print_out("Importing file: " + self.file_in)
-                # Process each line
-                for line in f:
-                    # Create a candidate
-                    candite = DownloadCandidate.make_candidate(line)
-                    # Check if the candidate is not None
-                    if candite is not None:
-                        # Add the candidate to the list
-                        self.candidates.append(candite)
-                    else:
-                        errors += 1
-            f.close()
+                # Read the file block by block
+                rest = ""
+                for block in iter(lambda: f.read(self.read_size), ""):
+                    lines = (rest + block).split("\n")
+                    # The last line can continue in the next block
+                    rest = lines.pop()
+                    self.add_candidates(DownloadCandidate.make_candidates(lines, bad))
+                # Parse the last line without newline
+                if rest != "":
+                    self.add_candidates(DownloadCandidate.make_candidates([rest], bad))
+            # Report the lines not parsed once
+            if bad:
+                self.output.print_err("Error: " + str(len(bad)) + " lines not parsed, first:\t" + "\t".join(bad[:self.report_errors]))
             # ACK message
             self.output.print_out("File imported")
+            errors = len(bad)
         except:
             self.output.print_err("Error: file\t" + self.file_in + "\tnot imported")
             errors = -1
@@ -198,6 +257,25 @@ class EUgolino(threading.Thread):
         # Return the number of errors
         return errors
     
+    def add_candidates(self, candidates: list[DownloadCandidate]) -> None:
+        """
+        Adds the imported candidates to the list, dropping the duplicates if a deduplicator is set.
+
+        Args:
+            candidates (list[DownloadCandidate]): The imported candidates.
+        """
+        if self.dedup is None:
+            self.candidates.extend(candidates)
+        else:
+            self.candidates.extend(self.dedup.filter(candidates))
+
+    def report_duplicates(self) -> None:
+        """
+        Prints the number of candidates dropped by the deduplicator.
+        """
+        if self.dedup is not None and len(self.dedup) > 0:
+            self.output.print_out("Duplicates\t" + str(len(self.dedup)) + "\tdropped (" + str(self.dedup.duplicate_urls) + " URLs, " + str(self.dedup.duplicate_names) + " file names)")
+
     def downloadPDF(self, candidate: DownloadCandidate = None, destination:str = None, not_downloaded_file = None) -> bool:
         """
         Downloads a PDF file from a given URL and saves it to the specified destination.
@@ -212,68 +290,590 @@ class EUgolino(threading.Thread):
         """
         if candidate is not None:
             self.current = candidate
+        else:
+            candidate = self.current
         if destination is not None:  
             self.destination = destination
         if not_downloaded_file is not None:
             self.not_downloaded_files = not_downloaded_file
-        full_path = self.destination + self.current.filename
+        full_path = self.destination + candidate.filename
+        event = DownloadEvent(candidate, self.name)
         try:
-            # Get the page
-            dat = requests.get(url=self.current.url)
-            # Get the cookies
-            cookies = dat.cookies
-            # Parse the page
-            soup = BeautifulSoup(dat.text, 'html.parser')
-            # Get the script tags
-            link = soup.find_all("script")
             # Find the link to the pdf
-            doc = ""
-            # Search for the link
-            for l in link:
-                # Check if the script tag contains the link to the pdf
-                if "window.location" in l.text:
-                    # Split the script tag to get the link
-                    s = l.text.split("\'")
-                    # Get the link
-                    doc = s[3]
+            with event.timing("resolve_time"):
+                link, cookies, cached = self.attempt(candidate, self.resolve, candidate, event=event, url=candidate.url)
+            event.link, event.cached = link, cached
             # Download the pdf
-            dat = requests.get(url=doc, cookies=cookies)
-            # Save the pdf
-            with open(full_path, "wb") as f:
-                f.write(dat.content)
-            f.close()
-            # Update the downloaded counter
-            self.downloaded += 1
+            with event.timing("fetch_time"):
+                event.bytes = self.attempt(candidate, self.fetch, candidate, link, cookies, cached, event, event=event, url=link)
+            # ACK message
+            self.mark_downloaded(candidate, full_path, event)
+            return True
+        except:
+            self.mark_not_downloaded(candidate, full_path, event.fail())
+            return False
+
+    async def downloadPDF_async(self, session: "aiohttp.ClientSession", candidate: DownloadCandidate) -> bool:
+        """
+        Downloads a PDF file like downloadPDF, awaiting the requests instead of blocking the thread.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the requests.
+            candidate (DownloadCandidate): The download candidate object containing the URL and filename.
+
+        Returns:
+            bool: True if the PDF file was successfully downloaded and saved, False otherwise.
+        """
+        self.current = candidate
+        full_path = self.destination + candidate.filename
+        event = DownloadEvent(candidate, self.name)
+        try:
+            # Find the link to the pdf
+            with event.timing("resolve_time"):
+                link, cookies, cached = await self.attempt_async(candidate, self.resolve_async, session, candidate, event=event, url=candidate.url)
+            event.link, event.cached = link, cached
+            # Download the pdf
+            with event.timing("fetch_time"):
+                event.bytes = await self.attempt_async(candidate, self.fetch_async, session, candidate, link, cached, event, event=event, url=link)
             # ACK message
-            self.output.print_out("Downloaded\t" + full_path)
+            self.mark_downloaded(candidate, full_path, event)
             return True
         except:
-            self.output.print_err("Error\t" + full_path + "\tnot downloaded")
+            self.mark_not_downloaded(candidate, full_path, event.fail())
+            return False
+
+    def resolve(self, candidate: DownloadCandidate) -> tuple:
+        """
+        Finds the link to the PDF of a candidate, from the cache or from its landing page.
+
+        Args:
+            candidate (DownloadCandidate): The download candidate object containing the URL and filename.
+
+        Returns:
+            tuple: The link to the PDF, the cookies of the landing page and True if the link comes from the cache.
+
+        Raises:
+            Exception: If the landing page can not be downloaded or parsed.
+        """
+        # Get the cached link
+        link = self.cache.get(candidate.url) if self.cache is not None else None
+        if link is not None:
+            return link, None, True
+        # Get the page
+        dat = self.pool.get(url=candidate.url)
+        # An error page has no link, its status tells if it can be retried
+        dat.raise_for_status()
+        # Find the link to the pdf
+        link = self.resolve_link(dat.text)
+        # Cache the link
+        if self.cache is not None and link != "":
+            self.cache.put(candidate.url, link)
+        # Return the cookies of this page, the session is shared by the workers
+        return link, dat.cookies, False
+
+    async def resolve_async(self, session: "aiohttp.ClientSession", candidate: DownloadCandidate) -> tuple:
+        """
+        Finds the link to the PDF of a candidate like resolve, awaiting the request.
+        The cookies of the landing page are kept by the session.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the request.
+            candidate (DownloadCandidate): The download candidate object containing the URL and filename.
+
+        Returns:
+            tuple: The link to the PDF, None and True if the link comes from the cache.
+
+        Raises:
+            Exception: If the landing page can not be downloaded or parsed.
+        """
+        # Get the cached link
+        link = self.cache.get(candidate.url) if self.cache is not None else None
+        if link is not None:
+            return link, None, True
+        # Get the page
+        await self.wait_limiter(candidate.url)
+        async with session.get(candidate.url) as r:
+            self.update_limiter(candidate.url, r)
+            # An error page has no link, its status tells if it can be retried
+            r.raise_for_status()
+            text = await r.text()
+        # Find the link to the pdf
+        link = self.resolve_link(text)
+        # Cache the link
+        if self.cache is not None and link != "":
+            self.cache.put(candidate.url, link)
+        return link, None, False
+
+    async def wait_limiter(self, url: str) -> None:
+        """
+        Waits for the rate limiter of the pool before an asyncio request, the requests of the pool wait by themselves.
+
+        Args:
+            url (str): The URL of the request.
+        """
+        if self.pool.limiter is not None:
+            await self.pool.limiter.wait_async(url)
+
+    def update_limiter(self, url: str, r: "aiohttp.ClientResponse") -> None:
+        """
+        Adapts the rate limiter of the pool to the response of an asyncio request.
+
+        Args:
+            url (str): The URL of the request.
+            r (aiohttp.ClientResponse): The response.
+        """
+        if self.pool.limiter is not None:
+            self.pool.limiter.update(url, r.status, r.headers.get("Retry-After"))
+
+    def fetch(self, candidate: DownloadCandidate, link: str, cookies = None, cached: bool = False, event: DownloadEvent = None) -> int:
+        """
+        Downloads the PDF of a candidate from its resolved link.
+        If a cached link fails, it is removed from the cache and the landing page is resolved again.
+
+        Args:
+            candidate (DownloadCandidate): The download candidate object containing the URL and filename.
+            link (str): The link to the PDF.
+            cookies (optional): The cookies of the landing page. Defaults to None.
+            cached (bool, optional): True if the link comes from the cache. Defaults to False.
+            event (DownloadEvent, optional): The event recording the download. Defaults to None.
+
+        Returns:
+            int: The number of bytes written.
+
+        Raises:
+            Exception: If the download fails.
+        """
+        full_path = self.destination + candidate.filename
+        try:
+            # Download the pdf
+            return self.fetchPDF(link, full_path, cookies, event)
+        except:
+            if not cached:
+                raise
+        # Forget the link
+        self.cache.remove(candidate.url)
+        # Resolve the page again
+        link, cookies, cached = self.resolve(candidate)
+        if event is not None:
+            event.link, event.cached = link, cached
+        return self.fetchPDF(link, full_path, cookies, event)
+
+    async def fetch_async(self, session: "aiohttp.ClientSession", candidate: DownloadCandidate, link: str, cached: bool = False, event: DownloadEvent = None) -> int:
+        """
+        Downloads the PDF of a candidate from its resolved link like fetch, awaiting the requests.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the requests.
+            candidate (DownloadCandidate): The download candidate object containing the URL and filename.
+            link (str): The link to the PDF.
+            cached (bool, optional): True if the link comes from the cache. Defaults to False.
+            event (DownloadEvent, optional): The event recording the download. Defaults to None.
+
+        Returns:
+            int: The number of bytes written.
+
+        Raises:
+            Exception: If the download fails.
+        """
+        full_path = self.destination + candidate.filename
+        try:
+            # Download the pdf
+            return await self.fetchPDF_async(session, link, full_path, event)
+        except:
+            if not cached:
+                raise
+        # Forget the link
+        self.cache.remove(candidate.url)
+        # Resolve the page again
+        link, cookies, cached = await self.resolve_async(session, candidate)
+        if event is not None:
+            event.link, event.cached = link, cached
+        return await self.fetchPDF_async(session, link, full_path, event)
+
+    def resolve_link(self, html: str) -> str:
+        """
+        Finds the link to the PDF in the "window.location" script of a landing page.
+
+        The script tags are matched with a precompiled pattern,
+        the page is parsed with BeautifulSoup only if the pattern finds nothing.
+
+        Args:
+            html (str): The landing page.
+
+        Returns:
+            str: The link to the PDF.
+
+        Raises:
+            IndexError: If the script does not contain the link.
+        """
+        # Find the link to the pdf
+        doc = ""
+        # Check if the page contains the redirect
+        if "window.location" in html:
+            # Search for the link, the last script wins
+            for m in self.script_pattern.finditer(html):
+                # Check if the script tag contains the link to the pdf
+                if "window.location" in m.group(1):
+                    # Split the script tag to get the link
+                    s = m.group(1).split("\'")
+                    if len(s) > 3:
+                        doc = s[3]
+        if doc != "":
+            return doc
+        # Update the fallback counter
+        with self.lock:
+            self.fallbacks += 1
+        # Parse the page
+        soup = BeautifulSoup(html, 'html.parser')
+        # Search for the link
+        for l in soup.find_all("script"):
+            # Check if the script tag contains the link to the pdf
+            if "window.location" in l.text:
+                # Split the script tag to get the link
+                s = l.text.split("\'")
+                # Get the link
+                doc = s[3]
+        return doc
+
+    def fetchPDF(self, url: str, full_path: str, cookies = None, event: DownloadEvent = None) -> int:
+        """
+        Downloads the PDF file at the given URL and streams it to disk in chunks.
+
+        The chunks are written to a partial file, which is renamed to full_path only when the download is complete,
+        so that an interrupted download never leaves a truncated PDF.
+        If a partial file is left by a previous attempt, the download is resumed with a Range request.
+
+        Args:
+            url (str): The URL of the PDF file.
+            full_path (str): The path where the PDF file will be saved.
+            cookies (optional): The cookies to send with the request. Defaults to None.
+            event (DownloadEvent, optional): The event recording the status of the response. Defaults to None.
+
+        Returns:
+            int: The number of bytes written.
+
+        Raises:
+            Exception: If the download or the writing fails.
+        """
+        size = 0
+        # Download the pdf
+        with self.pool.get(url=url, cookies=cookies, headers=self.resume_headers(full_path), stream=True) as dat:
+            if event is not None:
+                event.status = dat.status_code
+            # Check if the partial file is not valid anymore
+            if dat.status_code == 416:
+                self.discard_part(full_path)
+                return self.fetchPDF(url, full_path, cookies, event)
+            dat.raise_for_status()
+            # Save the pdf
+            with self.open_part(full_path, dat.status_code, dat.headers) as f:
+                for chunk in dat.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+        # Publish the pdf
+        self.publish_part(full_path)
+        return size
+
+    async def fetchPDF_async(self, session: "aiohttp.ClientSession", url: str, full_path: str, event: DownloadEvent = None) -> int:
+        """
+        Downloads the PDF file at the given URL like fetchPDF, awaiting the chunks instead of blocking the thread.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to send the request.
+            url (str): The URL of the PDF file.
+            full_path (str): The path where the PDF file will be saved.
+            event (DownloadEvent, optional): The event recording the status of the response. Defaults to None.
+
+        Returns:
+            int: The number of bytes written.
+
+        Raises:
+            Exception: If the download or the writing fails.
+        """
+        size = 0
+        # Download the pdf
+        await self.wait_limiter(url)
+        async with session.get(url, headers=self.resume_headers(full_path)) as r:
+            self.update_limiter(url, r)
+            if event is not None:
+                event.status = r.status
+            # Check if the partial file is not valid anymore
+            if r.status == 416:
+                self.discard_part(full_path)
+                return await self.fetchPDF_async(session, url, full_path, event)
+            r.raise_for_status()
+            # Save the pdf
+            with self.open_part(full_path, r.status, r.headers) as f:
+                async for chunk in r.content.iter_chunked(self.chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+        # Publish the pdf
+        self.publish_part(full_path)
+        return size
+
+    def resume_headers(self, full_path: str) -> dict:
+        """
+        Makes the headers to resume the partial file of a PDF.
+
+        Args:
+            full_path (str): The path where the PDF file will be saved.
+
+        Returns:
+            dict: The Range and If-Range headers, or an empty dictionary if there is nothing to resume.
+        """
+        part = full_path + self.part_suffix
+        headers = {}
+        try:
+            # Get the size of the partial file
+            size = os.path.getsize(part)
+        except OSError:
+            size = 0
+        if size > 0:
+            # Ask for the missing bytes
+            headers["Range"] = "bytes=" + str(size) + "-"
+            try:
+                # Ask for the whole file if the PDF changed
+                with open(part + self.meta_suffix, "r") as f:
+                    validator = f.read().strip()
+                if validator != "":
+                    headers["If-Range"] = validator
+            except OSError:
+                pass
+        return headers
+
+    def open_part(self, full_path: str, status: int, headers) -> BinaryIO:
+        """
+        Opens the partial file of a PDF to write the body of a response.
+
+        A 206 response is appended to the partial file,
+        any other response restarts the file from the beginning and records its validator.
+
+        Args:
+            full_path (str): The path where the PDF file will be saved.
+            status (int): The status code of the response.
+            headers: The headers of the response.
+
+        Returns:
+            BinaryIO: The partial file opened for writing.
+
+        Raises:
+            ValueError: If the returned range does not start at the end of the partial file.
+        """
+        part = full_path + self.part_suffix
+        meta = part + self.meta_suffix
+        # Check if the server resumed the download
+        if status == 206:
+            # Get the first byte of the range, as in "bytes 100-199/200"
+            start = headers.get("Content-Range", "").split(" ")[-1].split("-")[0]
+            if not start.isdigit() or int(start) != os.path.getsize(part):
+                self.discard_part(full_path)
+                raise ValueError("Range not matching the partial file\t" + part)
+            return open(part, "ab")
+        # Get the validator, weak ETags can not be used with If-Range
+        validator = headers.get("ETag")
+        if validator is None or validator.startswith("W/"):
+            validator = headers.get("Last-Modified")
+        # Record the validator
+        if validator is not None:
+            with open(meta, "w") as f:
+                f.write(validator)
+        elif os.path.exists(meta):
+            os.remove(meta)
+        return open(part, "wb")
+
+    def publish_part(self, full_path: str) -> None:
+        """
+        Renames the completed partial file of a PDF to its final path.
+
+        Args:
+            full_path (str): The path where the PDF file will be saved.
+        """
+        part = full_path + self.part_suffix
+        os.replace(part, full_path)
+        if os.path.exists(part + self.meta_suffix):
+            os.remove(part + self.meta_suffix)
+
+    def discard_part(self, full_path: str) -> None:
+        """
+        Removes the partial file of a PDF and its validator.
+
+        Args:
+            full_path (str): The path where the PDF file will be saved.
+        """
+        part = full_path + self.part_suffix
+        for f in (part, part + self.meta_suffix):
+            if os.path.exists(f):
+                os.remove(f)
+
+    def mark_downloaded(self, candidate: DownloadCandidate, full_path: str, event: DownloadEvent = None) -> None:
+        """
+        Records a successful download: updates the counter and logs the ACK message and the event.
+
+        Args:
+            candidate (DownloadCandidate): The downloaded candidate.
+            full_path (str): The path where the PDF file was saved.
+            event (DownloadEvent, optional): The event recording the download. Defaults to None.
+        """
+        # Update the downloaded counter
+        with self.lock:
+            self.downloaded += 1
+        # Update the queue
+        if self.queue is not None:
+            self.queue.done(candidate)
+        # Record the download
+        if self.journal is not None:
+            self.journal.record(candidate.print_candidate())
+        if self.existing is not None:
+            with self.lock:
+                self.existing.add(candidate.filename)
+        # ACK message
+        self.output.print_out(self.next_progress() + "Downloaded\t" + full_path)
+        self.log_event(event, "downloaded")
+
+    def mark_not_downloaded(self, candidate: DownloadCandidate, full_path: str, event: DownloadEvent = None) -> None:
+        """
+        Records a failed download: logs the error and the event and appends the candidate to the not downloaded file.
+
+        Args:
+            candidate (DownloadCandidate): The candidate which was not downloaded.
+            full_path (str): The path where the PDF file should have been saved.
+            event (DownloadEvent, optional): The event recording the download. Defaults to None.
+        """
+        # Check if the candidate is queued again
+        if self.queue is not None and self.queue.fail(candidate):
+            self.output.print_err("Error\t" + full_path + "\tnot downloaded, queued again")
+            self.log_event(event, "requeued")
+            return
+        self.output.print_err("Error\t" + full_path + "\tnot downloaded")
+        with self.lock:
             try:
                 # Save the not downloaded file
                 with open(self.not_downloaded_files, "a") as f:
-                    f.write(self.current.print_candidate() + "\n")
+                    f.write(candidate.print_candidate() + "\n")
                 f.close()
                 # Update the input file
                 self.file_in = self.not_downloaded_files
             except:
                 self.output.print_err("Error\t" + self.not_downloaded_files + "\tnot updated")
-            self.output.print_out("FAIL\t\t" + full_path)
-            return False
+        self.output.print_out(self.next_progress() + "FAIL\t\t" + full_path)
+        self.log_event(event, "failed")
+
+    def log_event(self, event: DownloadEvent, outcome: str) -> None:
+        """
+        Writes the event of a download to the event log.
+
+        Args:
+            event (DownloadEvent): The event recording the download, None if it was not recorded.
+            outcome (str): The outcome of the download.
+        """
+        if event is not None:
+            event.outcome = outcome
+            self.output.print_event(event.to_dict())
+
+    def next_candidates(self, source):
+        """
+        Takes the next candidates to download, skipping the ones already downloaded.
+
+        Args:
+            source (Iterable[DownloadCandidate]): The candidates to take.
+
+        Yields:
+            DownloadCandidate: The next candidate to download.
+        """
+        source = iter(source)
+        # Stop taking candidates when the download is stopped
+        while not self.stopping.is_set():
+            candidate = next(source, None)
+            if candidate is None:
+                return
+            # Check if the candidate was already downloaded
+            if self.is_done(candidate):
+                # Count it as processed
+                self.next_progress()
+                self.skipped += 1
+                if self.queue is not None:
+                    self.queue.done(candidate)
+            else:
+                yield candidate
+
+    def is_done(self, candidate: DownloadCandidate) -> bool:
+        """
+        Checks if a candidate was already downloaded, according to the journal or to the destination folder.
+
+        Args:
+            candidate (DownloadCandidate): The candidate to check.
+
+        Returns:
+            bool: True if the candidate was already downloaded, False otherwise.
+        """
+        if self.existing is not None and candidate.filename in self.existing:
+            return True
+        return self.journal is not None and self.journal.is_done(candidate.print_candidate())
+
+    def scan_destination(self) -> int:
+        """
+        Indexes the names of the files in the destination folder with a single scan.
+        The partial files are not indexed.
+
+        Returns:
+            int: The number of indexed files.
+        """
+        self.existing = set()
+        with os.scandir(self.destination) as entries:
+            for entry in entries:
+                if not entry.name.endswith((self.part_suffix, self.part_suffix + self.meta_suffix)):
+                    self.existing.add(entry.name)
+        return len(self.existing)
+
+    def next_progress(self) -> str:
+        """
+        Advances the progress counter of the current download.
+
+        Returns:
+            str: The "[i/num]:" progress prefix, or an empty string if no download is in progress.
+        """
+        progress = self.advance_progress()
+        # Check if a download is in progress
+        if progress == 0:
+            return ""
+        return "[" + "{:{}}".format(progress, self.count_digits(self.total)) + '/' + str(self.total) + "]:\t"
+
+    def advance_progress(self, lines: int = 1) -> int:
+        """
+        Advances the progress counter of the current download by some lines, for instance the ones dropped by the links file.
+
+        Args:
+            lines (int, optional): The number of lines processed. Defaults to 1.
+
+        Returns:
+            int: The new progress, 0 if no download is in progress.
+        """
+        with self.lock:
+            # Check if a download is in progress
+            if self.total <= 0:
+                return 0
+            # Update the progress
+            if self.progress_counter is not None:
+                with self.progress_counter.get_lock():
+                    self.progress_counter.value += lines
+                    self.progress = self.progress_counter.value
+            else:
+                self.progress += lines
+            return self.progress
 
     def download_all(self, candidates: list[DownloadCandidate] = None, destination:str = None, max_downloads:int = None, starting_point:int = None, not_downloaded_files:str = None) -> int:
         """
         Downloads all the PDF files from the given list of download candidates.
 
         Args:
-            candidates (list[DownloadCandidate], optional): List of DownloadCandidate objects representing the PDF files to download. If not provided, the previously set candidates will be used. Defaults to None.
+            candidates (list[DownloadCandidate], optional): List of DownloadCandidate objects representing the PDF files to download, or a CandidateFile which reads them while they are downloaded. If not provided, the previously set candidates will be used. Defaults to None.
             destination (str, optional): The destination folder where the downloaded PDF files will be saved. If not provided, the previously set destination will be used. Defaults to None.
             max_downloads (int, optional): The maximum number of PDF files to download. If not provided, all the candidates will be downloaded. Defaults to None.
             starting_point (int, optional): The starting point for the download. If not provided, the previously set starting point will be used. Defaults to None.
             not_downloaded_files (str, optional): The file path to save the list of files that were not downloaded. If not provided, the previously set file path will be used. Defaults to None.
 
         Returns:
-            int: The number of errors that occurred during the download process.
+            int: The number of candidates which were not downloaded.
         """
         if candidates is not None:
             self.candidates = candidates
@@ -287,40 +887,342 @@ class EUgolino(threading.Thread):
             if self.max_downloads < 0 or starting_point < self.max_downloads:
                 self.starting_point = starting_point
 
-        # Initialize the errors counter
-        errors = 0
-
         # Create the destination folder
         os.makedirs(self.destination, exist_ok=True)
+        # Index the files already downloaded
+        if self.skip_existing:
+            self.scan_destination()
+
+        # Check if the candidates are read while downloading
+        if isinstance(self.candidates, CandidateFile):
+            # The file skips the first candidates and stops at the last one or at the end of the file
+            num = self.starting_point + len(self.candidates)
+            source = self.candidates
+            # The lines dropped by the file count in the progress
+            source.on_drop = self.advance_progress
+        else:
+            # Get the number of downloads
+            num = self.candidates.__len__()
 
-        # Get the number of downloads
-        num = self.candidates.__len__()
-
-        # Check if the number of downloads is limited
-        if self.max_downloads > 0:
-            # Limit the number of downloads
-            num = min(num, self.max_downloads)
-
-        # Get the number of digits of the length
-        fi = self.count_digits(num)
-        # Discard the first candidates
-        self.candidates = self.candidates[self.starting_point:]
-        # Download the PDFs
-        for i in range(self.starting_point, num):
-            # Get the filename
-            self.current = self.candidates.pop(0)
-
-            # Print the progress
-            self.output.print_out("[" + "{:{}}".format((i+1), fi) + '/' + str(num) + "]:", end="\t")
-
-            # Download the PDF
-            if not self.downloadPDF():
-                # Update the errors counter
-                errors += 1
-                # Add the not downloaded file to the list of candidates
-                self.candidates.append(self.current)
+            # Check if the number of downloads is limited
+            if self.max_downloads > 0:
+                # Limit the number of downloads
+                num = min(num, self.max_downloads)
+
+            # Take the candidates between the starting point and the max downloads
+            source = itertools.islice(self.candidates, self.starting_point, num)
+
+        # Initialize the progress
+        self.total = num if self.progress_total < 0 else self.progress_total
+        self.progress = self.starting_point
+        self.skipped = 0
+        self.fallbacks = 0
+        # Queue the candidates
+        self.queue = WorkQueue(source, max_requeues=self.requeues)
+        # Check if the asyncio backend is requested but not available
+        if self.backend == "asyncio" and aiohttp is None:
+            self.output.print_err("Error\taiohttp not installed, using the thread backend")
+            self.backend = "thread"
+        # Download until no candidate is queued again
+        while self.queue.has_pending() and not self.stopping.is_set():
+            # Skip the candidates already downloaded
+            source = self.next_candidates(self.queue)
+            # Check the backend
+            if self.backend == "asyncio":
+                # Download the PDFs with the event loop
+                asyncio.run(self.download_async(source))
+            elif self.resolvers > 0:
+                # Download the PDFs with the resolving and the downloading workers
+                self.download_pipeline(source)
+            elif self.workers > 1:
+                # Download the PDFs with the workers
+                self.download_parallel(source)
+            else:
+                # Download the PDFs
+                for self.current in source:
+                    self.downloadPDF()
+        # Keep the not downloaded candidates
+        self.candidates = self.queue.failed
+        errors = self.queue.counts[WorkQueue.FAILED]
+        # Reset the progress
+        self.queue = None
+        self.total = 0
+        # Close the journal
+        if self.journal is not None:
+            self.journal.close()
+        # Compact the cache
+        if self.cache is not None:
+            try:
+                self.cache.save()
+            except:
+                self.output.print_err("Error\t" + self.cache.path + "\tnot saved")
+        # Report the skipped candidates
+        if self.skipped > 0:
+            self.output.print_out("Skipped\t" + str(self.skipped) + "\talready downloaded")
+        # Report the pages which needed the full parser
+        if self.fallbacks > 0:
+            self.output.print_out("Fallback\t" + str(self.fallbacks) + "\tpages parsed with BeautifulSoup")
 
         return errors
+
+    def download_parallel(self, candidates) -> None:
+        """
+        Downloads the candidates with a pool of workers.
+
+        At most twice the number of workers candidates are submitted at the same time,
+        so that the pool does not hold the whole list of candidates.
+
+        Args:
+            candidates (Iterable[DownloadCandidate]): The candidates to download.
+        """
+        # Limit the submitted candidates
+        slots = threading.BoundedSemaphore(2 * self.workers)
+
+        def download(candidate: DownloadCandidate) -> None:
+            try:
+                # Download the PDF
+                self.downloadPDF(candidate)
+            finally:
+                # Free the slot
+                slots.release()
+
+        # Start the workers
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name) as pool:
+            for candidate in candidates:
+                # Wait for a free slot
+                slots.acquire()
+                # Submit the download
+                pool.submit(download, candidate)
+
+    def download_pipeline(self, candidates) -> None:
+        """
+        Downloads the candidates with two stages of workers connected by a bounded queue.
+
+        The resolvers find the links to the PDFs in the landing pages,
+        the workers download the PDFs from the resolved links.
+        When the queue is full the resolvers wait, so that they do not run ahead of the downloads.
+
+        Args:
+            candidates (Iterable[DownloadCandidate]): The candidates to download.
+        """
+        # Resolved links
+        links = queue.Queue(maxsize=self.queue_size)
+        # Candidates to resolve
+        candidates = iter(candidates)
+        # Lock for taking the next candidate
+        feed = threading.Lock()
+
+        def resolve() -> None:
+            while True:
+                # Get the next candidate
+                with feed:
+                    candidate = next(candidates, None)
+                if candidate is None:
+                    return
+                self.current = candidate
+                event = DownloadEvent(candidate, self.name)
+                try:
+                    # Find the link to the pdf
+                    with event.timing("resolve_time"):
+                        link, cookies, cached = self.attempt(candidate, self.resolve, candidate, event=event, url=candidate.url)
+                    event.link, event.cached = link, cached
+                    links.put((candidate, event, link, cookies, cached))
+                except:
+                    self.mark_not_downloaded(candidate, self.destination + candidate.filename, event.fail())
+
+        def fetch() -> None:
+            while True:
+                # Get the next resolved link
+                job = links.get()
+                if job is None:
+                    return
+                candidate, event, link, cookies, cached = job
+                try:
+                    # Download the pdf
+                    with event.timing("fetch_time"):
+                        event.bytes = self.attempt(candidate, self.fetch, candidate, link, cookies, cached, event, event=event, url=link)
+                    # ACK message
+                    self.mark_downloaded(candidate, self.destination + candidate.filename, event)
+                except:
+                    self.mark_not_downloaded(candidate, self.destination + candidate.filename, event.fail())
+
+        # Start the downloading workers
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name + "-fetch") as fetchers:
+            for i in range(self.workers):
+                fetchers.submit(fetch)
+            # Start the resolving workers and wait for them
+            with ThreadPoolExecutor(max_workers=self.resolvers, thread_name_prefix=self.name + "-resolve") as resolvers:
+                for i in range(self.resolvers):
+                    resolvers.submit(resolve)
+            # Stop the downloading workers
+            for i in range(self.workers):
+                links.put(None)
+
+    def attempt(self, candidate: DownloadCandidate, step, *args, event: DownloadEvent = None, url: str = None):
+        """
+        Runs a step of a download, repeating it with the retry policy while it fails for a transient reason.
+        Each attempt takes its own slot of the shared budget, which is free during the backoff.
+
+        Args:
+            candidate (DownloadCandidate): The candidate being downloaded.
+            step (Callable): The step to run.
+            *args: The arguments of the step.
+            event (DownloadEvent, optional): The event counting the attempts. Defaults to None.
+            url (str, optional): The URL requested by the step. Defaults to None.
+
+        Returns:
+            Any: The result of the step.
+        """
+        if self.retry is None:
+            return self.spend_budget(url, step, *args)
+        return self.retry.call(self.spend_budget, url, step, *args, on_retry=self.retry_logger(candidate, event))
+
+    async def attempt_async(self, candidate: DownloadCandidate, step, *args, event: DownloadEvent = None, url: str = None):
+        """
+        Awaits a step of a download like attempt.
+
+        Args:
+            candidate (DownloadCandidate): The candidate being downloaded.
+            step (Callable): The coroutine function to run.
+            *args: The arguments of the step.
+            event (DownloadEvent, optional): The event counting the attempts. Defaults to None.
+            url (str, optional): The URL requested by the step. Defaults to None.
+
+        Returns:
+            Any: The result of the step.
+        """
+        if self.retry is None:
+            return await self.spend_budget_async(url, step, *args)
+        return await self.retry.call_async(self.spend_budget_async, url, step, *args, on_retry=self.retry_logger(candidate, event))
+
+    def retry_logger(self, candidate: DownloadCandidate, event: DownloadEvent = None):
+        """
+        Makes the function which logs the retries of a candidate.
+
+        Args:
+            candidate (DownloadCandidate): The candidate being downloaded.
+            event (DownloadEvent, optional): The event counting the attempts. Defaults to None.
+
+        Returns:
+            Callable[[int, Exception, float], None]: The function called before each new attempt.
+        """
+        def log(attempt: int, error: Exception, delay: float) -> None:
+            if event is not None:
+                event.attempts += 1
+            self.output.print_out("Retry\t" + self.destination + candidate.filename + "\tattempt " + str(attempt) + " failed (" + type(error).__name__ + "), again in " + "{:.2f}".format(delay) + " s")
+        return log
+
+    def blocked(self, url: str) -> float:
+        """
+        Gets how long the host of a URL is blocked by the rate limiter of the pool.
+
+        Args:
+            url (str): The URL of the request, None if the step sends no request.
+
+        Returns:
+            float: Seconds until the host can be contacted again, 0 if it is not blocked.
+        """
+        if url is None or self.pool.limiter is None:
+            return 0
+        return self.pool.limiter.blocked(url)
+
+    def spend_budget(self, url: str, step, *args):
+        """
+        Runs an attempt of a step in a slot of the shared budget.
+        The Retry-After of a blocked host is waited before taking the slot, so that it does not keep the slot of the other downloaders.
+
+        Args:
+            url (str): The URL requested by the step, None if it sends no request.
+            step (Callable): The step to run.
+            *args: The arguments of the step.
+
+        Returns:
+            Any: The result of the step.
+        """
+        if self.budget is None:
+            return step(*args)
+        while True:
+            # Wait for the host
+            time.sleep(self.blocked(url))
+            self.budget.acquire()
+            # A host blocked while waiting for the slot gives it back
+            if self.blocked(url) <= 0:
+                break
+            self.budget.release()
+        try:
+            return step(*args)
+        finally:
+            self.budget.release()
+
+    async def spend_budget_async(self, url: str, step, *args):
+        """
+        Awaits an attempt of a step in a slot of the shared budget like spend_budget.
+        The slot is waited in a thread, one download at a time, so that neither the event loop nor its threads are blocked.
+
+        Args:
+            url (str): The URL requested by the step, None if it sends no request.
+            step (Callable): The coroutine function to run.
+            *args: The arguments of the step.
+
+        Returns:
+            Any: The result of the step.
+        """
+        if self.budget is None:
+            return await step(*args)
+        while True:
+            # Wait for the host
+            await asyncio.sleep(self.blocked(url))
+            async with self.budget_turn:
+                if not self.budget.acquire(blocking=False):
+                    await asyncio.get_running_loop().run_in_executor(None, self.budget.acquire)
+            # A host blocked while waiting for the slot gives it back
+            if self.blocked(url) <= 0:
+                break
+            self.budget.release()
+        try:
+            return await step(*args)
+        finally:
+            self.budget.release()
+
+    async def download_async(self, candidates) -> None:
+        """
+        Downloads the candidates on a single thread with the asyncio backend.
+
+        At most async_limit downloads are in flight at the same time
+        and at most async_limit_per_host connections are opened to the same host.
+
+        Args:
+            candidates (Iterable[DownloadCandidate]): The candidates to download.
+        """
+        # Limit the in-flight downloads
+        slots = asyncio.Semaphore(self.async_limit)
+        # Running downloads
+        tasks = set()
+        # Limit the connections
+        connector = aiohttp.TCPConnector(limit=self.async_limit, limit_per_host=self.async_limit_per_host, force_close=not self.pool.keep_alive)
+        # Never hang on a connection or a response
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.pool.connect_timeout, sock_read=self.pool.read_timeout)
+
+        async def download(session: aiohttp.ClientSession, candidate: DownloadCandidate) -> None:
+            try:
+                # Download the PDF
+                await self.downloadPDF_async(session, candidate)
+            finally:
+                # Free the slot
+                slots.release()
+
+        # The downloads wait for the shared budget one at a time
+        self.budget_turn = asyncio.Lock()
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            for candidate in candidates:
+                # Wait for a free slot
+                await slots.acquire()
+                # Start the download
+                task = asyncio.create_task(download(session, candidate))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            # Wait for the last downloads
+            await asyncio.gather(*tasks)
     
     def do_all(self, file_in:str = None, destination:str = None, max_downloads:int = None, not_downloaded_files:str = None) -> int:
         """
@@ -345,8 +1247,27 @@ class EUgolino(threading.Thread):
             self.max_downloads = max_downloads
         if not_downloaded_files is not None:
             self.not_downloaded_files = not_downloaded_files
+        # Forget the candidates of the previous runs
+        if self.dedup is not None:
+            self.dedup.clear()
+        # Check if the candidates are read while downloading
+        if self.stream_import and self.candidates == []:
+            # Check the file
+            if not os.path.isfile(self.file_in):
+                self.output.print_err("Error: file\t" + self.file_in + "\tnot imported")
+                return -1
+            # Read the file from the starting point to the max downloads, 0 or less reads until the end like the list
+            stream = CandidateFile(self.file_in, start=self.starting_point, end=self.max_downloads if self.max_downloads > 0 else -1, output=self.output, indexed=self.links_index, dedup=self.dedup)
+            # Download the PDFs
+            errors += self.download_all(candidates=stream)
+            self.report_duplicates()
+            # Add the lines not parsed
+            errors += stream.errors
+            # Return the number of errors
+            return errors
         # Initialize the lists
         errors += self.import_file()
+        self.report_duplicates()
         # Check the errors
         if errors == 0:
             # Download the PDFs
@@ -360,6 +1281,12 @@ class EUgolino(threading.Thread):
         """
         self.do_all()
 
+    def stop(self) -> None:
+        """
+        Stops taking new candidates, the downloads in flight are completed.
+        """
+        self.stopping.set()
+
     @staticmethod
     def count_digits(n) -> int:
         """
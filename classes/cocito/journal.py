@@ -0,0 +1,110 @@
+#!/bin/python3
+'''
+    Journal  
+    file name: journal.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import threading
+
+
+class Journal:
+    """
+    Journal class.
+
+    An append-only file with one line for each completed download, in the "<name>,<url>" CSV format.
+    It is loaded once in memory, so that a restarted download can skip the completed candidates in constant time.
+    """
+    path:str = None
+    """Path to the journal file"""
+    done:set = None
+    """Keys of the completed downloads"""
+    file = None
+    """Open handle of the journal file"""
+    lock:threading.Lock = None
+    """Lock for writing one line at a time"""
+
+    def __init__(self, path:str) -> None:
+        """
+        Initializes a Journal object and loads the completed downloads.
+
+        Args:
+            path (str): Path to the journal file.
+        """
+        self.path = path
+        self.done = set()
+        self.lock = threading.Lock()
+        self.load()
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the Journal object.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"path: {self.path}, done: {len(self.done)}"
+
+    def __len__(self) -> int:
+        """
+        Returns the number of completed downloads.
+
+        Returns:
+            int: Number of completed downloads.
+        """
+        return len(self.done)
+
+    def load(self) -> int:
+        """
+        Loads the completed downloads from the journal file.
+
+        Returns:
+            int: Number of completed downloads.
+        """
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    # A line truncated by a crash does not end with a newline
+                    if line.endswith("\n"):
+                        self.done.add(line[:-1])
+        except FileNotFoundError:
+            pass
+        return len(self.done)
+
+    def is_done(self, key:str) -> bool:
+        """
+        Checks if a download is completed.
+
+        Args:
+            key (str): Key of the download, as returned by DownloadCandidate.print_candidate.
+
+        Returns:
+            bool: True if the download is completed, False otherwise.
+        """
+        return key in self.done
+
+    def record(self, key:str) -> None:
+        """
+        Records a completed download.
+
+        Args:
+            key (str): Key of the download, as returned by DownloadCandidate.print_candidate.
+        """
+        with self.lock:
+            if key in self.done:
+                return
+            self.done.add(key)
+            # Keep the file open, each line is flushed
+            if self.file is None:
+                self.file = open(self.path, "a", buffering=1)
+            self.file.write(key + "\n")
+
+    def close(self) -> None:
+        """
+        Closes the journal file.
+        """
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,185 @@
+#!/bin/python3
+'''
+    LinksIndex  
+    file name: links_index.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import os
+import mmap
+from array import array
+
+class LinksIndex:
+    """
+    A sparse index of the line offsets of a links file.
+
+    The byte offset of one line every stride lines is saved in a sidecar file,
+    which is reused while the size and the modification time of the links file do not change.
+    Any line is reached by seeking to the closest indexed line and skipping less than stride lines in a memory map.
+    """
+    MAGIC: str = "EUGIDX1"
+    """First word of the sidecar file."""
+    path: str
+    """Path of the links file."""
+    index_path: str
+    """Path of the sidecar file."""
+    stride: int = 1024
+    """Number of lines between two indexed lines."""
+    size: int = 0
+    """Size of the links file when it was indexed."""
+    mtime: int = 0
+    """Modification time in nanoseconds of the links file when it was indexed."""
+    lines: int = 0
+    """Number of lines of the links file."""
+    offsets: array = None
+    """Byte offsets of the lines 0, stride, 2*stride, ..."""
+
+    def __init__(self, path: str, stride: int = None, index_path: str = None) -> None:
+        """
+        Constructor
+
+        Initializes an instance of LinksIndex, loading the sidecar file or building it if it is missing or outdated.
+
+        Args:
+            path (str): Path of the links file.
+            stride (int, optional): Number of lines between two indexed lines. Defaults to None.
+            index_path (str, optional): Path of the sidecar file. Defaults to the path of the links file followed by ".idx".
+
+        Raises:
+            OSError: If the links file can not be read.
+        """
+        self.path = path
+        self.index_path = index_path if index_path is not None else path + ".idx"
+        if stride is not None and stride > 0:
+            self.stride = stride
+        if not self.load():
+            self.build()
+            try:
+                self.save()
+            except OSError:
+                pass
+
+    def __str__(self) -> str:
+        return "File: " + self.path + "\nIndex: " + self.index_path + "\nLines: " + str(self.lines) + "\nStride: " + str(self.stride)
+
+    def __len__(self) -> int:
+        return self.lines
+
+    def load(self) -> bool:
+        """
+        Loads the sidecar file if it matches the current size and modification time of the links file.
+
+        Returns:
+            bool: True if the index was loaded, False if it has to be built.
+        """
+        st = os.stat(self.path)
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.readline().decode().split()
+                if len(header) != 5 or header[0] != self.MAGIC:
+                    return False
+                size, mtime, stride, lines = (int(h) for h in header[1:])
+                if size != st.st_size or mtime != st.st_mtime_ns:
+                    return False
+                offsets = array("Q")
+                offsets.frombytes(f.read())
+        except (OSError, ValueError):
+            return False
+        self.size, self.mtime, self.stride, self.lines, self.offsets = size, mtime, stride, lines, offsets
+        return True
+
+    def build(self) -> None:
+        """
+        Reads the links file once and indexes one line every stride lines.
+        """
+        st = os.stat(self.path)
+        self.size, self.mtime = st.st_size, st.st_mtime_ns
+        self.offsets = array("Q")
+        offset = 0
+        lines = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                # Index the line
+                if lines % self.stride == 0:
+                    self.offsets.append(offset)
+                offset += len(line)
+                lines += 1
+        self.lines = lines
+
+    def save(self) -> None:
+        """
+        Writes the sidecar file.
+        """
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write((" ".join((self.MAGIC, str(self.size), str(self.mtime), str(self.stride), str(self.lines))) + "\n").encode())
+            f.write(self.offsets.tobytes())
+        os.replace(tmp, self.index_path)
+
+    def offset(self, line: int, mm: mmap.mmap = None) -> int:
+        """
+        Finds the byte offset of a line.
+
+        Args:
+            line (int): The number of the line, starting from 0.
+            mm (mmap.mmap, optional): Memory map of the links file. Defaults to a new memory map.
+
+        Returns:
+            int: The byte offset of the line, or the size of the file if the line is past the end.
+        """
+        if line <= 0:
+            return 0
+        if line >= self.lines:
+            return self.size
+        # Seek to the closest indexed line
+        offset = self.offsets[line // self.stride]
+        skip = line % self.stride
+        if skip == 0:
+            return offset
+        # Skip the remaining lines
+        if mm is None:
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return self.offset(line, mm)
+        for i in range(skip):
+            offset = mm.find(b"\n", offset) + 1
+        return offset
+
+    def read(self, start: int = 0, end: int = -1):
+        """
+        Reads the lines from start to end through a memory map, without reading the previous lines.
+
+        Args:
+            start (int, optional): First line to read. Defaults to 0.
+            end (int, optional): Line after the last one to read, -1 to read until the end of the file. Defaults to -1.
+
+        Yields:
+            str: The next line.
+        """
+        if end < 0 or end > self.lines:
+            end = self.lines
+        if start >= end or self.size == 0:
+            return
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.seek(self.offset(start, mm))
+            for i in range(end - start):
+                yield mm.readline().decode()
+
+    def ranges(self, parts: int, start: int = 0, end: int = -1) -> list:
+        """
+        Splits the lines from start to end into contiguous ranges of about the same length.
+
+        Args:
+            parts (int): Number of ranges.
+            start (int, optional): First line. Defaults to 0.
+            end (int, optional): Line after the last one, -1 for the end of the file. Defaults to -1.
+
+        Returns:
+            list[tuple[int, int]]: The first line and the line after the last one of each range.
+        """
+        if end < 0 or end > self.lines:
+            end = self.lines
+        start = min(max(start, 0), end)
+        parts = max(parts, 1)
+        length = end - start
+        return [(start + length * i // parts, start + length * (i + 1) // parts) for i in range(parts)]
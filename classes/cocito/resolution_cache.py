@@ -0,0 +1,171 @@
+#!/bin/python3
+'''
+    ResolutionCache  
+    file name: resolution_cache.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+class ResolutionCache:
+    """
+    ResolutionCache class.
+
+    It remembers the PDF link found in each landing page, so that the next runs can download the PDF directly.
+    The links expire after a time to live and the least recently used ones are evicted when the cache is full.
+    Each new link is appended to the cache file, which is compacted by save.
+    """
+    path:str = None
+    """Path to the cache file"""
+    ttl:int = 7 * 24 * 60 * 60
+    """Seconds after which a link expires"""
+    max_size:int = 1000000
+    """Maximum number of links"""
+    links:OrderedDict = None
+    """Landing page URL to (PDF link, time) in least recently used order"""
+    file = None
+    """Open handle of the cache file"""
+    lock:threading.Lock = None
+    """Lock for the links and the file"""
+    compact:bool = True
+    """If False, save only closes the file, because other processes are appending to it"""
+
+    def __init__(self, path:str, ttl:int = None, max_size:int = None) -> None:
+        """
+        Initializes a ResolutionCache object and loads the links from the cache file.
+
+        Args:
+            path (str): Path to the cache file.
+            ttl (int, optional): Seconds after which a link expires. Defaults to None.
+            max_size (int, optional): Maximum number of links. Defaults to None.
+        """
+        self.path = path
+        if ttl is not None and ttl > 0:
+            self.ttl = ttl
+        if max_size is not None and max_size > 0:
+            self.max_size = max_size
+        self.links = OrderedDict()
+        self.lock = threading.Lock()
+        self.load()
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the ResolutionCache object.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"path: {self.path}, links: {len(self.links)}, ttl: {self.ttl}, max size: {self.max_size}"
+
+    def __len__(self) -> int:
+        """
+        Returns the number of links.
+
+        Returns:
+            int: Number of links.
+        """
+        return len(self.links)
+
+    def load(self) -> int:
+        """
+        Loads the links which are not expired from the cache file.
+
+        Returns:
+            int: Number of links.
+        """
+        now = time.time()
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    # Skip the lines truncated by a crash
+                    fields = line.rstrip("\n").split("\t")
+                    if not line.endswith("\n") or len(fields) != 3:
+                        continue
+                    url, link, stamp = fields
+                    try:
+                        stamp = float(stamp)
+                    except ValueError:
+                        continue
+                    # The last line of a URL wins
+                    self.links.pop(url, None)
+                    if now - stamp < self.ttl:
+                        self.links[url] = (link, stamp)
+        except FileNotFoundError:
+            pass
+        # Evict the oldest links
+        while len(self.links) > self.max_size:
+            self.links.popitem(last=False)
+        return len(self.links)
+
+    def get(self, url:str) -> str:
+        """
+        Gets the PDF link of a landing page.
+
+        Args:
+            url (str): URL of the landing page.
+
+        Returns:
+            str: The PDF link, or None if it is not cached or it is expired.
+        """
+        with self.lock:
+            item = self.links.get(url)
+            if item is None:
+                return None
+            # Check if the link is expired
+            if time.time() - item[1] >= self.ttl:
+                del self.links[url]
+                return None
+            # Mark the link as recently used
+            self.links.move_to_end(url)
+            return item[0]
+
+    def put(self, url:str, link:str) -> None:
+        """
+        Caches the PDF link of a landing page.
+
+        Args:
+            url (str): URL of the landing page.
+            link (str): Link to the PDF.
+        """
+        stamp = time.time()
+        with self.lock:
+            self.links[url] = (link, stamp)
+            self.links.move_to_end(url)
+            # Evict the least recently used link
+            if len(self.links) > self.max_size:
+                self.links.popitem(last=False)
+            # Keep the file open, each line is flushed
+            if self.file is None:
+                self.file = open(self.path, "a", buffering=1)
+            self.file.write(url + "\t" + link + "\t" + str(stamp) + "\n")
+
+    def remove(self, url:str) -> None:
+        """
+        Removes the PDF link of a landing page, for instance because it does not work anymore.
+
+        Args:
+            url (str): URL of the landing page.
+        """
+        with self.lock:
+            self.links.pop(url, None)
+
+    def save(self) -> None:
+        """
+        Compacts the cache file, writing only the cached links, and closes it.
+        """
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            if not self.compact:
+                return
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                for url, (link, stamp) in self.links.items():
+                    f.write(url + "\t" + link + "\t" + str(stamp) + "\n")
+            os.replace(tmp, self.path)
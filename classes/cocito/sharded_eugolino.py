@@ -0,0 +1,256 @@
+#!/bin/python3
+'''
+    ShardedEUgolino  
+    file name: sharded_eugolino.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import os
+import bisect
+import threading
+import multiprocessing
+
+from classes.log_manager import LogManager
+from classes.cocito.candidate_file import CandidateFile
+from classes.cocito.download_candidate import DownloadCandidate
+from classes.cocito.deduplicator import Deduplicator
+from classes.cocito.links_index import LinksIndex
+from classes.cocito.resolution_cache import ResolutionCache
+
+class ShardedEUgolino(threading.Thread):
+    """
+    A class which splits a links file into shards and downloads each shard with an EUgolino in its own process,
+    so that the parsing of the landing pages runs on all the cores.
+
+    The shards are contiguous ranges of lines, reached through a LinksIndex, or the lines whose file name hash matches the shard.
+    The duplicates are found once by this process before the split, so that a URL or a file name is never downloaded by two processes,
+    each shard receives the numbers of its duplicate lines and drops them.
+    Without a deduplicator the repeated lines are all downloaded: the contiguous shards can then write the same file at once,
+    while the hashed shards always give the lines with the same file name to the same process.
+    The processes share the progress counter and the log files, their not downloaded lists are merged at the end.
+    """
+    CONTIGUOUS: str = "contiguous"
+    """Mode splitting the file into contiguous ranges of lines."""
+    HASHED: str = "hashed"
+    """Mode splitting the file by the hash of the file names, so that the same file is always written by the same shard."""
+    counter = None
+    """Progress counter shared by the processes, set in each process by init_shard."""
+    factory = None
+    """Function without arguments which returns the EUgolino of a process, it must be importable by the processes."""
+    shards: int = 1
+    """Number of processes."""
+    mode: str = CONTIGUOUS
+    """Mode of the split."""
+    file_in: str = None
+    """Path of the links file."""
+    starting_point: int = 0
+    """First line to download."""
+    max_downloads: int = -1
+    """Line after the last one to download, -1 to download until the end of the file."""
+    not_downloaded_files: str = "not_downloaded.txt"
+    """File where the not downloaded candidates of all the shards are saved."""
+    output: LogManager = LogManager()
+    """Log Manager for logging."""
+    downloaded: int = 0
+    """Number of PDFs downloaded by all the shards."""
+    skipped: int = 0
+    """Number of candidates skipped by all the shards."""
+    dedup: Deduplicator = None
+    """Deduplicator finding the duplicates of all the shards before the split, None to keep them all."""
+
+    def __init__(self, factory, file_in: str, shards: int = None, mode: str = None, starting_point: int = None, max_downloads: int = None, not_downloaded_files: str = None, output: LogManager = None, name: str = "EUgolino", dedup: Deduplicator = None) -> None:
+        """
+        Constructor
+
+        Initializes an instance of ShardedEUgolino.
+
+        Args:
+            factory (Callable[[], EUgolino]): Function without arguments which returns the EUgolino of a process, it must be importable by the processes.
+            file_in (str): Path of the links file.
+            shards (int, optional): Number of processes. Defaults to None.
+            mode (str, optional): "contiguous" or "hashed". Defaults to None.
+            starting_point (int, optional): First line to download. Defaults to None.
+            max_downloads (int, optional): Line after the last one to download, 0 or less to download until the end of the file. Defaults to None.
+            not_downloaded_files (str, optional): File where the not downloaded candidates of all the shards are saved. Defaults to None.
+            output (LogManager, optional): LogManager instance for logging. Defaults to None.
+            name (str, optional): Name of the thread. Defaults to "EUgolino".
+            dedup (Deduplicator, optional): Deduplicator finding the duplicates of all the shards before the split. Defaults to None.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        super().__init__(name=name)
+        self.factory = factory
+        self.file_in = file_in
+        if shards is not None and shards > 0:
+            self.shards = shards
+        if mode is not None:
+            if mode not in (self.CONTIGUOUS, self.HASHED):
+                raise ValueError("Unknown shard mode: " + mode)
+            self.mode = mode
+        if starting_point is not None and starting_point >= 0:
+            self.starting_point = starting_point
+        if max_downloads is not None:
+            self.max_downloads = max_downloads
+        if not_downloaded_files is not None:
+            self.not_downloaded_files = not_downloaded_files
+        if output is not None:
+            self.output = output
+        self.dedup = dedup
+
+    def __str__(self) -> str:
+        return "File: " + self.file_in + "\nShards: " + str(self.shards) + "\nMode: " + self.mode
+
+    @staticmethod
+    def init_shard(counter) -> None:
+        """
+        Sets the shared progress counter in a new process.
+
+        Args:
+            counter (multiprocessing.Value): The progress counter.
+        """
+        ShardedEUgolino.counter = counter
+
+    @staticmethod
+    def run_shard(factory, file_in: str, shard: int, shards: int, start: int, end: int, total: int, hashed: bool, not_downloaded_files: str, skip: set = None) -> tuple:
+        """
+        Downloads one shard in the current process.
+
+        Args:
+            factory (Callable[[], EUgolino]): Function which returns the EUgolino of the process.
+            file_in (str): Path of the links file.
+            shard (int): Index of the shard.
+            shards (int): Number of shards.
+            start (int): First line of the shard.
+            end (int): Line after the last one of the shard.
+            total (int): Number of lines of all the shards.
+            hashed (bool): If True, the shard is made of the lines between start and end whose file name hash matches it.
+            not_downloaded_files (str): File where the not downloaded candidates of the shard are saved.
+            skip (set, optional): Numbers of the duplicate lines of the shard. Defaults to None.
+
+        Returns:
+            tuple[int, int, int, tuple]: The downloaded PDFs, the skipped candidates, the errors and the path, time to live and size of the resolution cache, or None.
+        """
+        e = factory()
+        e.not_downloaded_files = not_downloaded_files
+        e.starting_point = start
+        e.max_downloads = end
+        # Show the progress of all the shards
+        e.progress_counter = ShardedEUgolino.counter
+        e.progress_total = total
+        # The cache file is compacted once by the main process
+        if e.cache is not None:
+            e.cache.compact = False
+        # The duplicates were found by the main process
+        e.dedup = None
+        # Read the shard while downloading
+        stream = CandidateFile(file_in, start=start, end=end, output=e.output, indexed=e.links_index or not hashed, shard=shard if hashed else 0, shards=shards if hashed else 1, skip=skip)
+        try:
+            errors = e.download_all(candidates=stream) + stream.errors
+        finally:
+            e.pool.close()
+            # The pool terminates its processes without running the exit handlers
+            LogManager.close_all()
+        cache = (e.cache.path, e.cache.ttl, e.cache.max_size) if e.cache is not None else None
+        return e.downloaded, e.skipped, errors, cache
+
+    def do_all(self) -> int:
+        """
+        Splits the links file, downloads the shards in parallel processes and merges their results.
+
+        Returns:
+            int: The number of errors encountered during the process, -1 if the file can not be read.
+        """
+        # Check the file
+        if not os.path.isfile(self.file_in):
+            self.output.print_err("Error: file\t" + self.file_in + "\tnot imported")
+            return -1
+        # Index the file once for all the processes
+        index = LinksIndex(self.file_in)
+        end = self.max_downloads if self.max_downloads > 0 else -1
+        if self.mode == self.HASHED:
+            start, end = index.ranges(1, self.starting_point, end)[0]
+            ranges = [(start, end)] * self.shards
+        else:
+            ranges = index.ranges(self.shards, self.starting_point, end)
+        start, end = ranges[0][0], ranges[-1][1]
+        self.output.print_out("Sharding file: " + self.file_in + "\t" + str(self.shards) + " " + self.mode + " shards")
+        # Find the duplicates of all the shards
+        skips = self.find_duplicates(index, ranges)
+        # Each process writes its own not downloaded file
+        parts = [self.not_downloaded_files + ".shard" + str(i) for i in range(self.shards)]
+        tasks = [(self.factory, self.file_in, i, self.shards, s, e, end, self.mode == self.HASHED, parts[i], skips[i]) for i, (s, e) in enumerate(ranges)]
+        # Spawn clean processes, the threads of this one are not copied
+        context = multiprocessing.get_context("spawn")
+        counter = context.Value("q", start)
+        with context.Pool(self.shards, initializer=ShardedEUgolino.init_shard, initargs=(counter,)) as pool:
+            results = pool.starmap(ShardedEUgolino.run_shard, tasks)
+        # Merge the results
+        self.downloaded = sum(r[0] for r in results)
+        self.skipped = sum(r[1] for r in results)
+        errors = sum(r[2] for r in results)
+        self.merge_not_downloaded(parts)
+        # Compact the resolution cache written by all the processes
+        caches = set(r[3] for r in results if r[3] is not None)
+        for path, ttl, max_size in caches:
+            try:
+                ResolutionCache(path, ttl=ttl, max_size=max_size).save()
+            except:
+                self.output.print_err("Error\t" + path + "\tnot saved")
+        self.output.print_out("Shards\t" + str(self.shards) + "\t" + str(self.downloaded) + " downloaded, " + str(self.skipped) + " skipped, " + str(errors) + " errors")
+        return errors
+
+    def find_duplicates(self, index: LinksIndex, ranges: list) -> list:
+        """
+        Reads the lines of all the shards once and finds the ones repeating a URL or a file name of a previous line.
+
+        Args:
+            index (LinksIndex): The index of the links file.
+            ranges (list[tuple[int, int]]): The first line and the line after the last one of each shard.
+
+        Returns:
+            list[set]: The numbers of the duplicate lines of each shard.
+        """
+        skips = [set() for i in range(self.shards)]
+        if self.dedup is None:
+            return skips
+        self.dedup.clear()
+        starts = [s for s, e in ranges]
+        for n, line in enumerate(index.read(ranges[0][0], ranges[-1][1]), ranges[0][0]):
+            for candidate in DownloadCandidate.make_candidates([line]):
+                if not self.dedup.is_duplicate(candidate):
+                    continue
+                # Give the duplicate to the shard which reads its line
+                if self.mode == self.HASHED:
+                    skips[CandidateFile.shard_of(candidate, self.shards)].add(n)
+                else:
+                    skips[bisect.bisect_right(starts, n) - 1].add(n)
+        if len(self.dedup) > 0:
+            self.output.print_out("Duplicates\t" + str(len(self.dedup)) + "\tdropped (" + str(self.dedup.duplicate_urls) + " URLs, " + str(self.dedup.duplicate_names) + " file names)")
+        return skips
+
+    def merge_not_downloaded(self, parts: list[str]) -> None:
+        """
+        Appends the not downloaded files of the shards to the not downloaded file and removes them.
+
+        Args:
+            parts (list[str]): The not downloaded files of the shards.
+        """
+        for part in parts:
+            if not os.path.isfile(part):
+                continue
+            try:
+                with open(part, "r") as f, open(self.not_downloaded_files, "a") as out:
+                    out.write(f.read())
+                os.remove(part)
+                # The not downloaded candidates are the next input, as in EUgolino
+                self.file_in = self.not_downloaded_files
+            except:
+                self.output.print_err("Error\t" + self.not_downloaded_files + "\tnot updated")
+
+    def run(self) -> None:
+        """
+        Executes the do_all method as thread.
+        """
+        self.do_all()
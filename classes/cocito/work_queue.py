@@ -0,0 +1,147 @@
+#!/bin/python3
+'''
+    WorkQueue  
+    file name: work_queue.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import threading
+from collections import deque
+
+
+class WorkQueue:
+    """
+    A queue of download candidates which tracks the state of each download.
+
+    The candidates are taken from a source (a list or a CandidateFile) in constant time.
+    A failed candidate is queued again, behind the source, until it reaches the maximum number of requeues.
+    Each candidate moves between the states pending, in-flight, done and failed.
+    """
+    PENDING: str = "pending"
+    """State of the candidates waiting to be downloaded."""
+    IN_FLIGHT: str = "in-flight"
+    """State of the candidates being downloaded."""
+    DONE: str = "done"
+    """State of the downloaded candidates."""
+    FAILED: str = "failed"
+    """State of the candidates which were not downloaded after all the requeues."""
+    max_requeues: int = 0
+    """Number of times a failed candidate is queued again."""
+    source = None
+    """Iterator over the candidates not taken yet, None when it is exhausted."""
+    retries: deque = None
+    """Failed candidates queued again."""
+    attempts: dict = None
+    """Number of failed attempts of the candidates in the retries or in flight."""
+    counts: dict = None
+    """Number of candidates in each state, the pending ones of the source are not counted."""
+    failed: list = None
+    """Candidates which were not downloaded."""
+    lock: threading.Lock = None
+    """Lock for the state of the queue."""
+
+    def __init__(self, source, max_requeues: int = None) -> None:
+        """
+        Constructor
+
+        Initializes an instance of WorkQueue.
+
+        Args:
+            source (Iterable[DownloadCandidate]): The candidates to download.
+            max_requeues (int, optional): Number of times a failed candidate is queued again. Defaults to None.
+        """
+        self.source = iter(source)
+        if max_requeues is not None and max_requeues >= 0:
+            self.max_requeues = max_requeues
+        self.retries = deque()
+        self.attempts = {}
+        self.counts = {self.PENDING: 0, self.IN_FLIGHT: 0, self.DONE: 0, self.FAILED: 0}
+        self.failed = []
+        self.lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return ", ".join(state + ": " + str(n) for state, n in self.counts.items())
+
+    def __iter__(self):
+        """
+        Takes the candidates available now, the ones queued again while iterating included.
+        When the iteration stops some candidates can still be in flight and queued again later.
+
+        Yields:
+            DownloadCandidate: The next candidate to download.
+        """
+        while True:
+            candidate = self.get()
+            if candidate is None:
+                return
+            yield candidate
+
+    def get(self):
+        """
+        Takes the next candidate and marks it as in flight.
+        The source is taken first, then the candidates queued again.
+
+        Returns:
+            DownloadCandidate: The next candidate, None if no candidate is available now.
+        """
+        with self.lock:
+            candidate = None
+            # Take from the source
+            if self.source is not None:
+                candidate = next(self.source, None)
+                if candidate is None:
+                    self.source = None
+            # Take from the candidates queued again
+            if candidate is None and self.retries:
+                candidate = self.retries.popleft()
+                self.counts[self.PENDING] -= 1
+            if candidate is not None:
+                self.counts[self.IN_FLIGHT] += 1
+            return candidate
+
+    def done(self, candidate) -> None:
+        """
+        Marks an in-flight candidate as done.
+
+        Args:
+            candidate (DownloadCandidate): The downloaded candidate.
+        """
+        with self.lock:
+            self.attempts.pop(candidate, None)
+            self.counts[self.IN_FLIGHT] -= 1
+            self.counts[self.DONE] += 1
+
+    def fail(self, candidate) -> bool:
+        """
+        Marks an in-flight candidate as failed, queueing it again if it has requeues left.
+
+        Args:
+            candidate (DownloadCandidate): The candidate which was not downloaded.
+
+        Returns:
+            bool: True if the candidate was queued again, False if it failed for good.
+        """
+        with self.lock:
+            self.counts[self.IN_FLIGHT] -= 1
+            attempts = self.attempts.get(candidate, 0) + 1
+            # Check if the candidate can be queued again
+            if attempts <= self.max_requeues:
+                self.attempts[candidate] = attempts
+                self.retries.append(candidate)
+                self.counts[self.PENDING] += 1
+                return True
+            self.attempts.pop(candidate, None)
+            self.failed.append(candidate)
+            self.counts[self.FAILED] += 1
+            return False
+
+    def has_pending(self) -> bool:
+        """
+        Checks if some candidates are waiting to be downloaded.
+
+        Returns:
+            bool: True if the source or the requeued candidates are not exhausted, False otherwise.
+        """
+        with self.lock:
+            return self.source is not None or len(self.retries) > 0
@@ -0,0 +1,139 @@
+#!/bin/python3
+'''
+    HTTPPool  
+    file name: http_pool.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from classes.rate_limiter import RateLimiter
+
+
+class HTTPPool:
+    """
+    HTTPPool class.
+
+    It shares a requests session, so that the connections to the same host are kept alive
+    and reused instead of opening a new TCP and TLS connection for each request.
+    The session can be shared between threads.
+    """
+    pool_connections:int = 10
+    """Number of hosts whose connections are kept in the pool"""
+    pool_maxsize:int = 10
+    """Maximum number of connections kept for each host"""
+    pool_block:bool = False
+    """If True, the requests wait for a free connection when a host reaches pool_maxsize"""
+    keep_alive:bool = True
+    """If True, the connections are kept alive between requests"""
+    session:requests.Session = None
+    """Shared session"""
+    limiter:RateLimiter = None
+    """Rate limiter of the requests to each host, None for no limit"""
+    connect_timeout:float = 10
+    """Seconds to wait for a connection"""
+    read_timeout:float = 60
+    """Seconds to wait for the next bytes of a response"""
+
+    def __init__(self, pool_connections:int = None, pool_maxsize:int = None, pool_block:bool = None, keep_alive:bool = None, limiter:RateLimiter = None, connect_timeout:float = None, read_timeout:float = None) -> None:
+        """
+        Initializes an HTTPPool object.
+
+        Args:
+            pool_connections (int, optional): Number of hosts whose connections are kept in the pool. Defaults to None.
+            pool_maxsize (int, optional): Maximum number of connections kept for each host. Defaults to None.
+            pool_block (bool, optional): If True, wait for a free connection when a host reaches pool_maxsize. Defaults to None.
+            keep_alive (bool, optional): If True, keep the connections alive between requests. Defaults to None.
+            limiter (RateLimiter, optional): Rate limiter of the requests to each host. Defaults to None.
+            connect_timeout (float, optional): Seconds to wait for a connection. Defaults to None.
+            read_timeout (float, optional): Seconds to wait for the next bytes of a response. Defaults to None.
+        """
+        if pool_connections is not None and pool_connections > 0:
+            self.pool_connections = pool_connections
+        if pool_maxsize is not None and pool_maxsize > 0:
+            self.pool_maxsize = pool_maxsize
+        if pool_block is not None:
+            self.pool_block = pool_block
+        if keep_alive is not None:
+            self.keep_alive = keep_alive
+        if limiter is not None:
+            self.limiter = limiter
+        if connect_timeout is not None and connect_timeout > 0:
+            self.connect_timeout = connect_timeout
+        if read_timeout is not None and read_timeout > 0:
+            self.read_timeout = read_timeout
+        # Make the session
+        self.session = requests.Session()
+        # Make the connection pool
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Close the connections after each request
+        if not self.keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the HTTPPool object.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"pool connections: {self.pool_connections}, pool maxsize: {self.pool_maxsize}, pool block: {self.pool_block}, keep alive: {self.keep_alive}"
+
+    def get(self, url:str, **kwargs) -> requests.Response:
+        """
+        Sends a GET request through the pool.
+
+        Args:
+            url (str): The URL of the request.
+            **kwargs: Arguments passed to requests.Session.get.
+
+        Returns:
+            requests.Response: The response.
+        """
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url:str, **kwargs) -> requests.Response:
+        """
+        Sends a POST request through the pool.
+
+        Args:
+            url (str): The URL of the request.
+            **kwargs: Arguments passed to requests.Session.post.
+
+        Returns:
+            requests.Response: The response.
+        """
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method:str, url:str, **kwargs) -> requests.Response:
+        """
+        Sends a request through the pool, waiting for the rate limiter of its host.
+        The request never hangs: the timeouts of the pool are used unless others are given.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL of the request.
+            **kwargs: Arguments passed to requests.Session.request.
+
+        Returns:
+            requests.Response: The response.
+        """
+        kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+        if self.limiter is None:
+            return self.session.request(method, url, **kwargs)
+        # Wait for a token of the host
+        self.limiter.wait(url)
+        r = self.session.request(method, url, **kwargs)
+        # Adapt the rate to the response
+        self.limiter.update(url, r.status_code, r.headers.get("Retry-After"))
+        return r
+
+    def close(self) -> None:
+        """
+        Closes the connections of the pool.
+        """
+        self.session.close()
@@ -7,9 +7,15 @@
 '''
 
 import sys
+import json
+import atexit
+import threading
 from io import TextIOWrapper
 from typing import TextIO
 
+from classes.log_writer import LogWriter
+from classes.log_rotator import LogRotator
+
 
 class LogManager:
     """
@@ -27,12 +33,26 @@ class LogManager:
     """Error log"""
     err_file:str = None
     """Path to the error log file"""
+    events_file:str = None
+    """Path to the event log file, where each download is recorded as a JSON line"""
     duplicate:bool = False
     """Flag to duplicate the logs"""
     duplicate_out:bool = False
     """Flag to duplicate the output logs"""
+    lock:threading.Lock = threading.Lock()
+    """Lock shared by the log managers to write one message at a time"""
+    buffered:bool = False
+    """If True, the messages to the log files are queued to a background writer which keeps the files open"""
+    flush_interval:float = 1.0
+    """Max seconds a buffered message waits before being written"""
+    flush_size:int = 64 * 1024
+    """Bytes of buffered messages which are written at once"""
+    writers:dict = {}
+    """Background writer of each log file, shared by the log managers"""
+    rotator:LogRotator = None
+    """Rotator of the log files, None if they grow without limit"""
 
-    def __init__(self, out_file:str = "", out:TextIOWrapper = sys.stdout, err_file:str = "", err:TextIOWrapper = sys.stderr, duplicate_out:bool = False, duplicate:bool = False) -> None:
+    def __init__(self, out_file:str = "", out:TextIOWrapper = sys.stdout, err_file:str = "", err:TextIOWrapper = sys.stderr, duplicate_out:bool = False, duplicate:bool = False, buffered:bool = False, flush_interval:float = None, flush_size:int = None, rotator:LogRotator = None, events_file:str = "") -> None:
         """
         Initializes a LogManager object.
 
@@ -42,6 +62,11 @@ class LogManager:
             out (TextIOWrapper): Output log stream (default: sys.stdout).
             err (TextIOWrapper): Error log stream (default: sys.stderr).
             duplicate (bool): Flag to duplicate the logs (default: False).
+            buffered (bool): Flag to write the log files from a background thread (default: False).
+            flush_interval (float): Max seconds a buffered message waits before being written (optional).
+            flush_size (int): Bytes of buffered messages which are written at once (optional).
+            rotator (LogRotator): Rotator of the log files (optional).
+            events_file (str): Path to the event log file (optional).
         """
         if out_file != "":
             try:
@@ -59,11 +84,25 @@ class LogManager:
             except:
                 self.err_file = None
         self.err = err
+        if events_file != "":
+            try:
+                events = open(events_file, "a")
+                self.events_file = events_file
+                events.close()
+            except:
+                self.events_file = None
         self.duplicate = duplicate
         if self.duplicate:
             self.duplicate_out = True
         else:
             self.duplicate_out = duplicate_out
+        self.buffered = buffered
+        if flush_interval is not None and flush_interval > 0:
+            self.flush_interval = flush_interval
+        if flush_size is not None and flush_size > 0:
+            self.flush_size = flush_size
+        if rotator is not None and rotator.is_enabled():
+            self.rotator = rotator
     
     def __str__(self) -> str:
         """
@@ -84,21 +123,29 @@ class LogManager:
         """
         if duplicate is None:
             duplicate = self.duplicate_out
-        # Check if the output log file is set
-        if self.is_outfile_set():
-            # Open the output log file
-            self.out = open(self.out_file, "a")
-            # Print the message to the output log file
-            print(message, file=self.out, end=end)
-            # Close the output log file
-            self.out.close()
-        else:
-            # Print the message to the output log
-            print(message, file=self.out, end=end)
-        # Check if the logs should be duplicated
-        if duplicate and self.out != self.OUT:
-            # Print the message to the standard output
-            print(message, file=self.OUT, end=end)
+        # Write one message at a time
+        with self.lock:
+            # Check if the output log file is buffered
+            if self.buffered and self.is_outfile_set():
+                self.writer(self.out_file).write(message + end)
+            # Check if the output log file is set
+            elif self.is_outfile_set():
+                # Open the output log file
+                self.out = open(self.out_file, "a")
+                # Print the message to the output log file in one write, other processes can append to it
+                self.out.write(message + end)
+                size = self.out.tell()
+                # Close the output log file
+                self.out.close()
+                # Rotate the output log file
+                self.rotate(self.out_file, size)
+            else:
+                # Print the message to the output log
+                print(message, file=self.out, end=end)
+            # Check if the logs should be duplicated
+            if duplicate and self.out != self.OUT:
+                # Print the message to the standard output
+                print(message, file=self.OUT, end=end)
     
     def print_err(self, message:str, duplicate:bool = None, end:str = '\n') -> None:
         """
@@ -110,21 +157,52 @@ class LogManager:
         """
         if duplicate is None:
             duplicate = self.duplicate
-        # Check if the error log file is set
-        if self.is_errfile_set():
-            # Open the error log file
-            self.err = open(self.err_file, "a")
-            # Print the message to the error log file
-            print(message, file=self.err, end=end)
-            # Close the error log file
-            self.err.close()
-        else:
-            # Print the message to the error log
-            print(message, file=self.err, end=end)
-        # Check if the logs should be duplicated
-        if duplicate and self.err != self.ERR:
-            # Print the message to the standard error
-            print(message, file=self.ERR, end=end)
+        # Write one message at a time
+        with self.lock:
+            # Check if the error log file is buffered
+            if self.buffered and self.is_errfile_set():
+                self.writer(self.err_file).write(message + end)
+            # Check if the error log file is set
+            elif self.is_errfile_set():
+                # Open the error log file
+                self.err = open(self.err_file, "a")
+                # Print the message to the error log file in one write, other processes can append to it
+                self.err.write(message + end)
+                size = self.err.tell()
+                # Close the error log file
+                self.err.close()
+                # Rotate the error log file
+                self.rotate(self.err_file, size)
+            else:
+                # Print the message to the error log
+                print(message, file=self.err, end=end)
+            # Check if the logs should be duplicated
+            if duplicate and self.err != self.ERR:
+                # Print the message to the standard error
+                print(message, file=self.ERR, end=end)
+
+    def print_event(self, event:dict) -> None:
+        """
+        Appends an event to the event log as a JSON line, if the event log file is set.
+
+        Args:
+            event (dict): The fields of the event.
+        """
+        if not self.is_eventfile_set():
+            return
+        message = json.dumps(event, separators=(",", ":")) + "\n"
+        # Write one message at a time
+        with self.lock:
+            # Check if the event log file is buffered
+            if self.buffered:
+                self.writer(self.events_file).write(message)
+            else:
+                # Print the event to the event log file in one write, other processes can append to it
+                with open(self.events_file, "a") as events:
+                    events.write(message)
+                    size = events.tell()
+                # Rotate the event log file
+                self.rotate(self.events_file, size)
 
     def is_outfile_set(self) -> bool:
         """
@@ -143,3 +221,70 @@ class LogManager:
             bool: True if the error log file is set, False otherwise.
         """
         return self.err_file is not None
+
+    def rotate(self, path:str, size:int) -> None:
+        """
+        Rotates a log file written directly, if it is due.
+        It must be called with the lock.
+
+        Args:
+            path (str): Path to the log file.
+            size (int): Size of the log file after the last message.
+        """
+        if self.rotator is not None and self.rotator.is_due(path, size):
+            try:
+                self.rotator.rotate(path)
+            except OSError:
+                pass
+
+    def is_eventfile_set(self) -> bool:
+        """
+        Checks if the event log file is set.
+
+        Returns:
+            bool: True if the event log file is set, False otherwise.
+        """
+        return self.events_file is not None
+
+    def writer(self, path:str) -> LogWriter:
+        """
+        Gets the background writer of a log file, starting it the first time.
+        It must be called with the lock.
+
+        Args:
+            path (str): Path to the log file.
+
+        Returns:
+            LogWriter: The writer of the log file.
+        """
+        w = LogManager.writers.get(path)
+        if w is None or not w.is_alive():
+            w = LogWriter(path, flush_interval=self.flush_interval, flush_size=self.flush_size, rotator=self.rotator)
+            w.start()
+            LogManager.writers[path] = w
+        return w
+
+    def flush(self) -> None:
+        """
+        Writes the buffered messages of the log files of this log manager.
+        """
+        with self.lock:
+            writers = [LogManager.writers.get(p) for p in (self.out_file, self.err_file, self.events_file) if p is not None]
+        for w in writers:
+            if w is not None:
+                w.flush()
+
+    @staticmethod
+    def close_all() -> None:
+        """
+        Writes the buffered messages of all the log files and stops their writers.
+        It is called at exit, so that no message is lost.
+        """
+        with LogManager.lock:
+            writers = list(LogManager.writers.values())
+            LogManager.writers.clear()
+        for w in writers:
+            w.close()
+
+# Flush the buffered logs on shutdown
+atexit.register(LogManager.close_all)
@@ -0,0 +1,246 @@
+#!/bin/python3
+'''
+    LogRotator  
+    file name: log_rotator.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import os
+import gzip
+import time
+import shutil
+import threading
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class LogRotator:
+    """
+    LogRotator class.
+
+    It rotates a log file when it reaches max_bytes or when interval seconds have passed since the last rotation.
+    The log is moved to <log>.1.gz, the older archives are shifted to <log>.2.gz, <log>.3.gz and so on,
+    and the ones beyond backups are deleted. The new empty log is swapped in at once, so that the path of the log always exists.
+    The rotation is done under a lock on the directory of the log, which leaves no lock file behind,
+    so that the processes appending to the same log rotate it once, and the checkers never read a half written archive.
+    """
+    max_bytes:int = 0
+    """Size in bytes which rotates the log (0 for no limit)"""
+    interval:float = 0
+    """Seconds after which the log is rotated (0 for no limit)"""
+    backups:int = 5
+    """Number of archives kept (0 deletes the rotated log)"""
+    compress:bool = True
+    """If True, the archives are compressed with gzip"""
+    starts:dict = None
+    """Log path to the start of its current period"""
+    lock:threading.Lock = None
+    """Lock for the starts"""
+
+    def __init__(self, max_bytes:int = None, interval:float = None, backups:int = None, compress:bool = None) -> None:
+        """
+        Initializes a LogRotator object.
+
+        Args:
+            max_bytes (int, optional): Size in bytes which rotates the log (0 for no limit). Defaults to None.
+            interval (float, optional): Seconds after which the log is rotated (0 for no limit). Defaults to None.
+            backups (int, optional): Number of archives kept (0 deletes the rotated log). Defaults to None.
+            compress (bool, optional): If True, the archives are compressed with gzip. Defaults to None.
+        """
+        if max_bytes is not None and max_bytes >= 0:
+            self.max_bytes = max_bytes
+        if interval is not None and interval >= 0:
+            self.interval = interval
+        if backups is not None and backups >= 0:
+            self.backups = backups
+        if compress is not None:
+            self.compress = compress
+        self.starts = {}
+        self.lock = threading.Lock()
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the LogRotator object.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"max bytes: {self.max_bytes}, interval: {self.interval}, backups: {self.backups}, compress: {self.compress}"
+
+    def is_enabled(self) -> bool:
+        """
+        Checks if the logs are rotated at all.
+
+        Returns:
+            bool: True if a size or an interval is set, False otherwise.
+        """
+        return self.max_bytes > 0 or self.interval > 0
+
+    def start(self, path:str) -> float:
+        """
+        Gets the start of the current period of a log, the first call starts it.
+
+        Args:
+            path (str): Path to the log file.
+
+        Returns:
+            float: Start of the period, as a timestamp.
+        """
+        with self.lock:
+            start = self.starts.get(path)
+            if start is None:
+                start = self.starts[path] = time.time()
+        return start
+
+    def is_due(self, path:str, size:int) -> bool:
+        """
+        Checks if a log must be rotated.
+
+        Args:
+            path (str): Path to the log file.
+            size (int): Current size of the log file.
+
+        Returns:
+            bool: True if the log reached the size or the interval, False otherwise.
+        """
+        if size <= 0:
+            return False
+        if self.max_bytes > 0 and size >= self.max_bytes:
+            return True
+        if self.interval > 0 and time.time() - self.start(path) >= self.interval:
+            # Another process could have rotated it already
+            newest = self.archives(path)
+            if newest:
+                with self.lock:
+                    self.starts[path] = max(self.starts[path], os.path.getmtime(newest[0]))
+            return time.time() - self.start(path) >= self.interval
+        return False
+
+    def archive(self, path:str, n:int) -> str:
+        """
+        Gets the path to an archive of a log.
+
+        Args:
+            path (str): Path to the log file.
+            n (int): Number of the archive, 1 is the newest.
+
+        Returns:
+            str: Path to the archive.
+        """
+        return f"{path}.{n}.gz" if self.compress else f"{path}.{n}"
+
+    def rotate(self, path:str) -> bool:
+        """
+        Rotates a log if it is still due, and makes a new empty log.
+
+        Args:
+            path (str): Path to the log file.
+
+        Returns:
+            bool: True if the log was rotated, False if another process rotated it first.
+        """
+        with LogRotator.locked(path):
+            # Check again under the lock
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                return False
+            if not self.is_due(path, size):
+                return False
+            # Make the new empty log first, so that the path always exists
+            fresh = f"{path}.new"
+            open(fresh, "w").close()
+            if self.backups > 0:
+                # Delete the oldest archive and shift the others
+                for n in range(self.backups, 0, -1):
+                    old = self.archive(path, n)
+                    if not os.path.exists(old):
+                        continue
+                    if n == self.backups:
+                        os.remove(old)
+                    else:
+                        os.replace(old, self.archive(path, n + 1))
+                # Keep the log aside with a second link, then swap the new log in, the writers which keep it open notice the new inode
+                rotated = f"{path}.rotating"
+                if os.path.exists(rotated):
+                    os.remove(rotated)
+                os.link(path, rotated)
+                os.replace(fresh, path)
+                # Archive it
+                if self.compress:
+                    with open(rotated, "rb") as src, gzip.open(self.archive(path, 1), "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    os.remove(rotated)
+                else:
+                    os.replace(rotated, self.archive(path, 1))
+            else:
+                os.replace(fresh, path)
+            with self.lock:
+                self.starts[path] = time.time()
+            return True
+
+    @staticmethod
+    def archives(path:str) -> list:
+        """
+        Lists the archives of a log.
+
+        Args:
+            path (str): Path to the log file.
+
+        Returns:
+            list[str]: Paths to the archives, the newest first.
+        """
+        found = []
+        n = 1
+        while True:
+            for p in (f"{path}.{n}.gz", f"{path}.{n}"):
+                if os.path.exists(p):
+                    found.append(p)
+                    break
+            else:
+                return found
+            n += 1
+
+    @staticmethod
+    def open_archive(path:str, binary:bool = False):
+        """
+        Opens an archive of a log for reading.
+
+        Args:
+            path (str): Path to the archive.
+            binary (bool, optional): If True, the archive is read as bytes. Defaults to False.
+
+        Returns:
+            IO: The archive, decompressed if needed.
+        """
+        if path.endswith(".gz"):
+            return gzip.open(path, "rb" if binary else "rt")
+        return open(path, "rb" if binary else "r")
+
+    @staticmethod
+    @contextmanager
+    def locked(path:str):
+        """
+        Holds the lock of a log, shared with the other processes where flock is available.
+
+        The lock is taken on the directory of the log, so that no lock file is left next to it.
+
+        Args:
+            path (str): Path to the log file.
+        """
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
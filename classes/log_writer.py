@@ -0,0 +1,179 @@
+#!/bin/python3
+'''
+    LogWriter  
+    file name: log_writer.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import os
+import time
+import queue
+import threading
+
+from classes.log_rotator import LogRotator
+
+
+class LogWriter(threading.Thread):
+    """
+    LogWriter class.
+
+    A background thread which keeps a log file open and appends the messages queued by the log managers in batches.
+    A batch is written when it reaches flush_size bytes or when flush_interval seconds have passed since the last write,
+    with a single write, so that other processes appending to the same file never split a line.
+    With a rotator the file is rotated after the batch which makes it due, and it is opened again
+    when another process rotated it.
+    """
+    path:str = None
+    """Path to the log file"""
+    flush_interval:float = 1.0
+    """Max seconds a message waits in the queue"""
+    flush_size:int = 64 * 1024
+    """Bytes of messages which are written at once"""
+    messages:queue.SimpleQueue = None
+    """Queue of the messages, or of the events of the flush requests"""
+    file = None
+    """Open handle of the log file"""
+    rotator:LogRotator = None
+    """Rotator of the log file"""
+    STOP = object()
+    """Message stopping the writer"""
+
+    def __init__(self, path:str, flush_interval:float = None, flush_size:int = None, rotator:LogRotator = None) -> None:
+        """
+        Initializes a LogWriter object and opens the log file.
+
+        Args:
+            path (str): Path to the log file.
+            flush_interval (float, optional): Max seconds a message waits in the queue. Defaults to None.
+            flush_size (int, optional): Bytes of messages which are written at once. Defaults to None.
+            rotator (LogRotator, optional): Rotator of the log file. Defaults to None.
+        """
+        threading.Thread.__init__(self, name="LogWriter " + path, daemon=True)
+        self.path = path
+        if flush_interval is not None and flush_interval > 0:
+            self.flush_interval = flush_interval
+        if flush_size is not None and flush_size > 0:
+            self.flush_size = flush_size
+        if rotator is not None and rotator.is_enabled():
+            self.rotator = rotator
+        self.messages = queue.SimpleQueue()
+        self.open()
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the LogWriter object.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"path: {self.path}, flush interval: {self.flush_interval}, flush size: {self.flush_size}"
+
+    def write(self, message:str) -> None:
+        """
+        Queues a message.
+
+        Args:
+            message (str): The message, with its line end.
+        """
+        self.messages.put(message)
+
+    def flush(self, timeout:float = None) -> bool:
+        """
+        Writes the queued messages and waits for them.
+
+        Args:
+            timeout (float, optional): Max seconds to wait. Defaults to None.
+
+        Returns:
+            bool: True if the messages were written, False if the timeout expired.
+        """
+        if not self.is_alive():
+            return False
+        done = threading.Event()
+        self.messages.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """
+        Writes the queued messages, stops the writer and closes the log file.
+        """
+        if self.is_alive():
+            self.messages.put(self.STOP)
+            self.join()
+
+    def open(self) -> None:
+        """
+        Opens the log file for appending.
+        """
+        # Unbuffered, each batch is one write
+        self.file = open(self.path, "ab", buffering=0)
+
+    def is_rotated(self) -> bool:
+        """
+        Checks if the log file was moved by another process.
+
+        Returns:
+            bool: True if the path points to another file, False otherwise.
+        """
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self.file.fileno()).st_ino
+        except OSError:
+            return True
+
+    def write_batch(self, batch:list) -> None:
+        """
+        Appends a batch of messages to the log file.
+
+        Args:
+            batch (list[str]): The messages.
+        """
+        if batch:
+            try:
+                # Follow a rotation made by another process
+                if self.rotator is not None and self.is_rotated():
+                    self.file.close()
+                    self.open()
+                self.file.write("".join(batch).encode())
+                # Rotate the log file, the other processes appending to it make it grow too
+                if self.rotator is not None and self.rotator.is_due(self.path, os.fstat(self.file.fileno()).st_size):
+                    self.file.close()
+                    try:
+                        self.rotator.rotate(self.path)
+                    finally:
+                        self.open()
+            except OSError:
+                pass
+            batch.clear()
+
+    def run(self) -> None:
+        """
+        Drains the queue until the writer is stopped.
+        """
+        batch = []
+        size = 0
+        deadline = None
+        while True:
+            # Wait for a message, or for the deadline of the batch
+            try:
+                timeout = None if deadline is None else max(0, deadline - time.monotonic())
+                message = self.messages.get(timeout=timeout)
+            except queue.Empty:
+                message = None
+            if isinstance(message, str):
+                batch.append(message)
+                size += len(message)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                # Write a full batch
+                if size < self.flush_size:
+                    continue
+            # Write the batch on the deadline, the size, a flush or the stop
+            self.write_batch(batch)
+            size = 0
+            deadline = None
+            if isinstance(message, threading.Event):
+                message.set()
+            elif message is self.STOP:
+                break
+        self.file.close()
@@ -0,0 +1,144 @@
+#!/bin/python3
+'''
+    Orchestrator  
+    file name: orchestrator.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import threading
+
+from classes.log_manager import LogManager
+from classes.checkers.checker import Checker
+
+
+class Orchestrator:
+    """
+    Orchestrator class.
+
+    It runs many downloaders at the same time, each one with its own checkers,
+    and limits their requests in flight with a budget shared by all of them.
+    When a downloader ends its checkers are stopped, the shared checkers are stopped after the last downloader.
+    """
+    budget:int = 0
+    """Max number of requests in flight over all the downloaders (0 for no limit)"""
+    delay:int = 0
+    """Seconds to wait before starting the shared checkers"""
+    output:LogManager = LogManager()
+    """Log Manager for logging"""
+    downloaders:list = None
+    """Downloaders with their own checkers"""
+    checkers:list = None
+    """Checkers shared by all the downloaders"""
+    e:threading.Event = None
+    """Event set to stop the orchestrator"""
+
+    def __init__(self, budget:int = None, delay:int = None, output:LogManager = None) -> None:
+        """
+        Initializes an Orchestrator object.
+
+        Args:
+            budget (int, optional): Max number of requests in flight over all the downloaders (0 for no limit). Defaults to None.
+            delay (int, optional): Seconds to wait before starting the shared checkers. Defaults to None.
+            output (LogManager, optional): Log Manager for logging. Defaults to None.
+        """
+        if budget is not None and budget >= 0:
+            self.budget = budget
+        if delay is not None and delay >= 0:
+            self.delay = delay
+        if output is not None:
+            self.output = output
+        self.downloaders = []
+        self.checkers = []
+        self.e = threading.Event()
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the Orchestrator object.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"downloaders: {len(self.downloaders)}, checkers: {len(self.checkers)}, budget: {self.budget}"
+
+    def add(self, downloader:threading.Thread, *checkers:Checker) -> None:
+        """
+        Adds a downloader with the checkers which are stopped when it ends.
+
+        Args:
+            downloader (threading.Thread): The downloader, for instance an EUgolino or a GUElfo.
+            *checkers (Checker): The checkers of the downloader.
+        """
+        self.downloaders.append((downloader, list(checkers)))
+
+    def add_checker(self, checker:Checker) -> None:
+        """
+        Adds a checker which is stopped after all the downloaders end.
+
+        Args:
+            checker (Checker): The shared checker.
+        """
+        self.checkers.append(checker)
+
+    def run(self) -> None:
+        """
+        Starts the downloaders and the checkers, then waits for the downloaders and stops the checkers in order.
+        On KeyboardInterrupt the downloaders stop taking new candidates and complete the downloads in flight.
+        """
+        # Share the budget among the downloaders which support it, the sharded ones run in other processes
+        if self.budget > 0:
+            budget = threading.BoundedSemaphore(self.budget)
+            for downloader, checkers in self.downloaders:
+                if hasattr(downloader, "budget"):
+                    downloader.budget = budget
+        started = []
+        try:
+            # Start the downloaders and their checkers
+            for downloader, checkers in self.downloaders:
+                downloader.start()
+                for checker in checkers:
+                    checker.start()
+                    started.append(checker)
+            # Delay the shared checkers
+            self.e.wait(self.delay)
+            if not self.e.is_set():
+                for checker in self.checkers:
+                    checker.start()
+                    started.append(checker)
+            # Wait for each downloader and stop its checkers
+            for downloader, checkers in self.downloaders:
+                downloader.join()
+                self.stop_checkers(checkers, started)
+        except KeyboardInterrupt:
+            self.output.print_err("Interrupted\tcompleting the downloads in flight")
+            self.stop()
+            for downloader, checkers in self.downloaders:
+                if downloader.is_alive():
+                    downloader.join()
+                self.stop_checkers(checkers, started)
+        finally:
+            # Stop the shared checkers last
+            self.stop_checkers(self.checkers, started)
+
+    def stop(self) -> None:
+        """
+        Stops the downloaders from taking new candidates.
+        """
+        self.e.set()
+        for downloader, checkers in self.downloaders:
+            if hasattr(downloader, "stop"):
+                downloader.stop()
+
+    def stop_checkers(self, checkers:list, started:list) -> None:
+        """
+        Stops the checkers and waits for them.
+
+        Args:
+            checkers (list[Checker]): The checkers to stop.
+            started (list[Checker]): The checkers which were started, the other ones are not waited.
+        """
+        for checker in checkers:
+            checker.stop()
+        for checker in checkers:
+            if checker in started and checker.is_alive():
+                checker.join()
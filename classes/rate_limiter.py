@@ -0,0 +1,252 @@
+#!/bin/python3
+'''
+    RateLimiter  
+    file name: rate_limiter.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import time
+import asyncio
+import threading
+from urllib.parse import urlsplit
+from email.utils import parsedate_to_datetime
+
+
+class HostBucket:
+    """
+    Token bucket of a host.
+    """
+    __slots__ = ("tokens", "stamp", "rate", "epoch")
+    tokens:float
+    """Tokens available at stamp, negative when the next requests are already waiting"""
+    stamp:float
+    """Time of the last refill, in the future while the host asked not to be contacted"""
+    rate:float
+    """Tokens added each second"""
+    epoch:int
+    """Number of throttled responses, the reservations taken before the last one are not valid anymore"""
+
+    def __init__(self, tokens:float, rate:float) -> None:
+        """
+        Initializes a HostBucket object.
+
+        Args:
+            tokens (float): Tokens available.
+            rate (float): Tokens added each second.
+        """
+        self.tokens = tokens
+        self.stamp = time.monotonic()
+        self.rate = rate
+        self.epoch = 0
+
+
+class RateLimiter:
+    """
+    RateLimiter class.
+
+    It limits the requests sent to each host with a token bucket, shared by all the workers of the downloaders.
+    The rate of a host is halved when it answers 429 or 503, and the host is not contacted until its Retry-After expires:
+    the requests already waiting take a new turn at the new rate, so that they do not hit the host all together.
+    Each successful response raises the rate again, so that it settles at the highest rate accepted by the host.
+    """
+    THROTTLED:tuple = (429, 503)
+    """Status codes of a host asking to slow down"""
+    rate:float = 10
+    """Starting requests per second of each host"""
+    min_rate:float = 0.5
+    """Lowest requests per second of each host"""
+    max_rate:float = 100
+    """Highest requests per second of each host"""
+    burst:int = 10
+    """Requests which can be sent at once after a pause"""
+    decrease:float = 0.5
+    """Factor applied to the rate of a host asking to slow down"""
+    increase:float = 1
+    """Requests per second added to the rate of a host every second without throttling"""
+    max_block:float = 300
+    """Longest Retry-After honoured, in seconds"""
+    buckets:dict = None
+    """Host to its bucket"""
+    lock:threading.Lock = None
+    """Lock for the buckets"""
+
+    def __init__(self, rate:float = None, min_rate:float = None, max_rate:float = None, burst:int = None, decrease:float = None, increase:float = None) -> None:
+        """
+        Initializes a RateLimiter object.
+
+        Args:
+            rate (float, optional): Starting requests per second of each host. Defaults to None.
+            min_rate (float, optional): Lowest requests per second of each host. Defaults to None.
+            max_rate (float, optional): Highest requests per second of each host. Defaults to None.
+            burst (int, optional): Requests which can be sent at once after a pause. Defaults to None.
+            decrease (float, optional): Factor applied to the rate of a host asking to slow down. Defaults to None.
+            increase (float, optional): Requests per second added to the rate every second without throttling. Defaults to None.
+        """
+        if rate is not None and rate > 0:
+            self.rate = rate
+        if min_rate is not None and min_rate > 0:
+            self.min_rate = min_rate
+        if max_rate is not None and max_rate > 0:
+            self.max_rate = max_rate
+        if burst is not None and burst > 0:
+            self.burst = burst
+        if decrease is not None and 0 < decrease < 1:
+            self.decrease = decrease
+        if increase is not None and increase >= 0:
+            self.increase = increase
+        self.rate = min(max(self.rate, self.min_rate), self.max_rate)
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the RateLimiter object.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"rate: {self.rate}, min rate: {self.min_rate}, max rate: {self.max_rate}, burst: {self.burst}, hosts: {len(self.buckets)}"
+
+    def bucket(self, url:str) -> HostBucket:
+        """
+        Gets the bucket of the host of a URL, it must be called with the lock.
+
+        Args:
+            url (str): The URL.
+
+        Returns:
+            HostBucket: The bucket of the host.
+        """
+        host = urlsplit(url).netloc
+        b = self.buckets.get(host)
+        if b is None:
+            b = self.buckets[host] = HostBucket(self.burst, self.rate)
+        return b
+
+    def reserve(self, url:str) -> tuple:
+        """
+        Takes a token of the host of a URL.
+
+        Args:
+            url (str): The URL of the request.
+
+        Returns:
+            tuple[float, int]: Seconds to wait before sending the request and epoch of the reservation.
+        """
+        with self.lock:
+            b = self.bucket(url)
+            now = time.monotonic()
+            # Refill the bucket, unless the host is blocked
+            if now > b.stamp:
+                b.tokens = min(self.burst, b.tokens + (now - b.stamp) * b.rate)
+                b.stamp = now
+            # Take a token, a missing one is waited
+            b.tokens -= 1
+            wait = b.stamp - now
+            if b.tokens < 0:
+                wait += -b.tokens / b.rate
+            return wait, b.epoch
+
+    def is_valid(self, url:str, epoch:int) -> bool:
+        """
+        Checks if a reservation is still valid.
+
+        Args:
+            url (str): The URL of the request.
+            epoch (int): The epoch of the reservation.
+
+        Returns:
+            bool: False if the host was throttled after the reservation, True otherwise.
+        """
+        with self.lock:
+            return self.bucket(url).epoch == epoch
+
+    def blocked(self, url:str) -> float:
+        """
+        Gets how long the host of a URL is blocked by a throttled response, without taking a token.
+
+        Args:
+            url (str): The URL of the request.
+
+        Returns:
+            float: Seconds until the host can be contacted again, 0 if it is not blocked.
+        """
+        with self.lock:
+            return max(0.0, self.bucket(url).stamp - time.monotonic())
+
+    def wait(self, url:str) -> None:
+        """
+        Waits until a request can be sent to the host of a URL.
+
+        Args:
+            url (str): The URL of the request.
+        """
+        while True:
+            delay, epoch = self.reserve(url)
+            time.sleep(delay)
+            # A throttled response while waiting cancels the reservation
+            if self.is_valid(url, epoch):
+                return
+
+    async def wait_async(self, url:str) -> None:
+        """
+        Waits like wait, without blocking the event loop.
+
+        Args:
+            url (str): The URL of the request.
+        """
+        while True:
+            delay, epoch = self.reserve(url)
+            await asyncio.sleep(delay)
+            # A throttled response while waiting cancels the reservation
+            if self.is_valid(url, epoch):
+                return
+
+    def update(self, url:str, status:int, retry_after:str = None) -> None:
+        """
+        Adapts the rate of the host of a URL to the status of its response.
+
+        Args:
+            url (str): The URL of the request.
+            status (int): The status code of the response.
+            retry_after (str, optional): The Retry-After header of the response. Defaults to None.
+        """
+        with self.lock:
+            b = self.bucket(url)
+            if status in self.THROTTLED:
+                # Slow down
+                b.rate = max(self.min_rate, b.rate * self.decrease)
+                delay = self.retry_after(retry_after)
+                if delay is None:
+                    delay = 1 / b.rate
+                delay = min(delay, self.max_block)
+                # Block the host and cancel the reservations
+                b.stamp = max(b.stamp, time.monotonic() + delay)
+                b.tokens = 1
+                b.epoch += 1
+            elif status < 400:
+                # Speed up by increase every second
+                b.rate = min(self.max_rate, b.rate + self.increase / b.rate)
+
+    @staticmethod
+    def retry_after(value:str) -> float:
+        """
+        Parses a Retry-After header.
+
+        Args:
+            value (str): Seconds or HTTP date.
+
+        Returns:
+            float: Seconds to wait, None if the value is missing or not valid.
+        """
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,163 @@
+#!/bin/python3
+'''
+    RetryPolicy  
+    file name: retry_policy.py  
+    author: Lorenzo Radice  
+    license: European Union Public Licence v. 1.2.  
+'''
+
+import time
+import random
+import asyncio
+import requests
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class RetryPolicy:
+    """
+    RetryPolicy class.
+
+    It repeats a step of a download which failed for a transient reason: a connection error, a timeout,
+    a truncated body or a retryable status code. The attempts are spaced by an exponential backoff with full jitter,
+    so that the workers which failed together do not retry together.
+    """
+    attempts:int = 3
+    """Max number of attempts of a step, the first one included"""
+    backoff:float = 0.5
+    """Seconds of the backoff before the second attempt, doubled at each attempt"""
+    max_backoff:float = 30
+    """Longest backoff in seconds"""
+    statuses:tuple = (408, 429, "5xx")
+    """Retryable status codes, "5xx" stands for a whole class"""
+    errors:tuple = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError, asyncio.TimeoutError, ConnectionError, TimeoutError)
+    """Retryable exceptions"""
+
+    def __init__(self, attempts:int = None, backoff:float = None, max_backoff:float = None, statuses:tuple = None) -> None:
+        """
+        Initializes a RetryPolicy object.
+
+        Args:
+            attempts (int, optional): Max number of attempts of a step, the first one included. Defaults to None.
+            backoff (float, optional): Seconds of the backoff before the second attempt, doubled at each attempt. Defaults to None.
+            max_backoff (float, optional): Longest backoff in seconds. Defaults to None.
+            statuses (tuple, optional): Retryable status codes, "5xx" stands for a whole class. Defaults to None.
+        """
+        if attempts is not None and attempts > 0:
+            self.attempts = attempts
+        if backoff is not None and backoff >= 0:
+            self.backoff = backoff
+        if max_backoff is not None and max_backoff >= 0:
+            self.max_backoff = max_backoff
+        if statuses is not None:
+            self.statuses = tuple(statuses)
+        if aiohttp is not None:
+            self.errors = self.errors + (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the RetryPolicy object.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"attempts: {self.attempts}, backoff: {self.backoff}, max backoff: {self.max_backoff}, statuses: {self.statuses}"
+
+    def is_retryable_status(self, status:int) -> bool:
+        """
+        Checks if a status code is retryable.
+
+        Args:
+            status (int): The status code.
+
+        Returns:
+            bool: True if the status code or its class is retryable, False otherwise.
+        """
+        return status in self.statuses or str(status // 100) + "xx" in self.statuses
+
+    def is_retryable(self, error:Exception) -> bool:
+        """
+        Checks if an error is transient.
+
+        Args:
+            error (Exception): The error raised by a step.
+
+        Returns:
+            bool: True if the step can be repeated, False otherwise.
+        """
+        # Check the status of the response
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return self.is_retryable_status(error.response.status_code)
+        if aiohttp is not None and isinstance(error, aiohttp.ClientResponseError):
+            return self.is_retryable_status(error.status)
+        return isinstance(error, self.errors)
+
+    def delay(self, attempt:int) -> float:
+        """
+        Computes the backoff after a failed attempt.
+
+        Args:
+            attempt (int): The number of the failed attempt, starting from 1.
+
+        Returns:
+            float: Seconds to wait, chosen at random up to the exponential backoff.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def call(self, step, *args, on_retry = None):
+        """
+        Runs a step, repeating it while it fails for a transient reason.
+
+        Args:
+            step (Callable): The step to run.
+            *args: The arguments of the step.
+            on_retry (Callable[[int, Exception, float], None], optional): Called before each new attempt with the failed attempt, its error and the backoff. Defaults to None.
+
+        Returns:
+            Any: The result of the step.
+
+        Raises:
+            Exception: The error of the last attempt, or the first error which is not transient.
+        """
+        attempt = 1
+        while True:
+            try:
+                return step(*args)
+            except Exception as e:
+                if attempt >= self.attempts or not self.is_retryable(e):
+                    raise
+                delay = self.delay(attempt)
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                time.sleep(delay)
+                attempt += 1
+
+    async def call_async(self, step, *args, on_retry = None):
+        """
+        Runs a coroutine function like call, awaiting the backoff.
+
+        Args:
+            step (Callable): The coroutine function to run.
+            *args: The arguments of the step.
+            on_retry (Callable[[int, Exception, float], None], optional): Called before each new attempt with the failed attempt, its error and the backoff. Defaults to None.
+
+        Returns:
+            Any: The result of the step.
+
+        Raises:
+            Exception: The error of the last attempt, or the first error which is not transient.
+        """
+        attempt = 1
+        while True:
+            try:
+                return await step(*args)
+            except Exception as e:
+                if attempt >= self.attempts or not self.is_retryable(e):
+                    raise
+                delay = self.delay(attempt)
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
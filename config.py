@@ -15,13 +15,33 @@ outlog="output.log"
 """File where the output logs are saved"""
 errlog="error.log"
 """File where the error logs are saved"""
+eventlog="events.jsonl"
+"""File where the events of the downloads are saved, one JSON line each"""
+log_events:bool = False
+"""If True, each download is recorded in the event log with its link, status, size, times and attempts"""
 duplicate:bool = False
 """If True, the logs are duplicated on the console"""
+buffered_logs:bool = True
+"""If True, the logs are written in batches by a background thread which keeps the files open"""
+log_flush_interval:float = 1.0
+"""Max seconds a log message waits before being written"""
+log_flush_size:int = 64*1024
+"""Bytes of log messages which are written at once"""
+log_max_bytes:int = 100*1024*1024
+"""Size in bytes which rotates a log (0 for no limit)"""
+log_rotate_interval:float = 0
+"""Seconds after which a log is rotated (0 for no limit)"""
+log_backups:int = 5
+"""Number of rotated logs kept, as <log>.1.gz, <log>.2.gz and so on"""
+log_compress:bool = True
+"""If True, the rotated logs are compressed with gzip"""
 # Make paths
 outpath:str = log_dir+outlog
 """Path to the output log"""
 errpath:str = log_dir+errlog
 """Path to the error log"""
+eventpath:str = log_dir+eventlog
+"""Path to the event log"""
 
 # EUgolino Configuration
 eugolino_name:str = "EUgolino"
@@ -34,6 +54,46 @@ directory:str = "pdf/"
 """Directory where the files are saved"""
 starting_point:int = 0
 """Starting link"""
+stream_import:bool = True
+"""If True, the links are read while downloading instead of importing the whole file first"""
+links_index:bool = False
+"""If True, a sidecar index of the line offsets (<file>.idx) lets the streamed import jump to the starting link"""
+dedup:str = "exact"
+"""Drop the links whose URL or file name was already read: "exact", "bloom" (fixed memory, few false positives) or "" to disable"""
+dedup_capacity:int = 10000000
+"""Expected number of links of the bloom deduplication"""
+dedup_error_rate:float = 0.001
+"""Rate of unique links dropped by the bloom deduplication"""
+requeues:int = 1
+"""Number of times a failed link is queued again in the same run"""
+shards:int = 1
+"""Number of processes sharing the links file (1 downloads in this process, the links are always streamed with more)"""
+shard_mode:str = "contiguous"
+"""How the links are split among the processes: "contiguous" ranges of lines or "hashed" by file name (the duplicates are dropped before the split only with dedup)"""
+workers:int = 1
+"""Number of parallel downloads (1 downloads one link at a time)"""
+resolvers:int = 0
+"""Number of workers resolving the landing pages for the downloading workers (0 resolves and downloads in the same worker, thread backend only)"""
+queue_size:int = 100
+"""Max number of resolved links waiting for a downloading worker"""
+chunk_size:int = 64*1024
+"""Size in bytes of the chunks written to disk"""
+journal:str = "downloaded.txt"
+"""File recording the completed downloads, which are skipped on restart ("" to disable)"""
+skip_existing:bool = False
+"""If True, the links whose PDF is already in the directory are skipped"""
+resolution_cache:str = "resolved.txt"
+"""File caching the PDF link of each landing page between runs ("" to disable)"""
+cache_ttl:int = 7*24*60*60
+"""Seconds after which a cached PDF link expires"""
+cache_size:int = 1000000
+"""Max number of cached PDF links"""
+backend:str = "thread"
+"""Download backend: "thread" or "asyncio" (requires aiohttp)"""
+async_limit:int = 1000
+"""Max number of in-flight downloads of the asyncio backend"""
+async_limit_per_host:int = 100
+"""Max number of connections per host of the asyncio backend"""
 # GUElfo Configuration
 guelfo_name:str = "GUEelfo"
 """Name of the GUElfo"""
@@ -45,6 +105,50 @@ directory_guelfo:str = "pdf_guelfo/"
 """Directory where the files are saved"""
 starting_point_guelfo:int = 0
 """Starting link"""
+workers_guelfo:int = workers
+"""Number of parallel downloads (1 downloads one link at a time)"""
+journal_guelfo:str = "downloaded_guelfo.txt"
+"""File recording the completed downloads, which are skipped on restart ("" to disable)"""
+skip_existing_guelfo:bool = skip_existing
+"""If True, the links whose PDF is already in the directory are skipped"""
+
+# Orchestrator Configuration
+concurrent:bool = True
+"""If True, EUgolino and GUElfo download at the same time, otherwise GUElfo starts when EUgolino ends"""
+budget:int = 0
+"""Max number of requests in flight over EUgolino and GUElfo running at the same time, the retries wait without a slot (0 for no limit)"""
+
+# HTTP Configuration
+pool_connections:int = 10
+"""Number of hosts whose connections are kept in the pool"""
+pool_maxsize:int = 10
+"""Max number of connections kept for each host (should be at least the number of workers)"""
+pool_block:bool = False
+"""If True, the requests wait for a free connection when a host reaches pool_maxsize"""
+keep_alive:bool = True
+"""If True, the connections are kept alive between requests"""
+rate_limit:float = 10
+"""Starting requests per second to each host, adapted to the 429 and 503 responses (0 for no limit, the shard processes split the rates and the burst)"""
+rate_limit_min:float = 0.5
+"""Lowest requests per second to each host"""
+rate_limit_max:float = 100
+"""Highest requests per second to each host"""
+rate_burst:int = 10
+"""Requests which can be sent at once to a host after a pause"""
+
+# Retry Configuration
+retry_attempts:int = 3
+"""Max number of attempts of each step of a download (1 for no retry)"""
+retry_backoff:float = 0.5
+"""Seconds of the backoff before the second attempt, doubled at each attempt with random jitter"""
+retry_max_backoff:float = 30
+"""Longest backoff in seconds"""
+retry_statuses:tuple = (408, 429, "5xx")
+"""Retryable status codes ("5xx" stands for the whole class)"""
+connect_timeout:float = 10
+"""Seconds to wait for a connection"""
+read_timeout:float = 60
+"""Seconds to wait for the next bytes of a response"""
 
 # Checker Configuration
 checker_name:str = "Checker"
@@ -60,6 +164,10 @@ delay:int = sleep_time // 2
 # Folder Checker Configuration
 fname:str = checker_name+" Folder Checker"
 """Name of the Folder Checker"""
+folder_watch:bool = True
+"""If True, the files are counted from the inotify events of the folder instead of listing it at each check (Linux only)"""
+folder_counter:str = "scandir"
+"""How the files are counted at each check without inotify: "listdir" or "scandir" (without building the list of the names)"""
 URL_FOL:str = "https://localhost"
 """URL of the folder checker"""
 # Log Checker Configuration
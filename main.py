@@ -16,11 +16,32 @@ def main():
     '''
         Main function of the EUgolino project.
     '''
+    # HTTP connections
+    pool = poolset()
+    """Pool of HTTP connections"""
     # Program
-    eugolino = eugolinoset(output=logset())
+    eugolino = shardset(output=logset()) if shards > 1 else eugolinoset(output=logset(), pool=pool)
     """EUgolino instance"""
-    fcheck, lcheck = checkerset()
+    fcheck, lcheck = checkerset(pool=pool)
     """Checkers"""
+    # Check if the downloaders run at the same time
+    if concurrent:
+        guelfo = guelfoset(output=logset(), pool=pool)
+        """GUElfo instance"""
+        gcheck = checker_guelfoset(pool=pool)
+        """GUElfo Folder Checker"""
+        orchestrator = orchestratorset(output=logset())
+        """Orchestrator of the downloaders"""
+        # Each downloader with its folder checker
+        orchestrator.add(eugolino, fcheck)
+        orchestrator.add(guelfo, gcheck)
+        # The log checker watches both
+        orchestrator.add_checker(lcheck)
+        # Run until both downloaders end
+        orchestrator.run()
+        # Close the connections
+        pool.close()
+        return
     # Start EUgolino
     eugolino.start()
     # Start the checkers
@@ -34,9 +55,9 @@ def main():
     fcheck.stop()
     fcheck.join()
     # Start Guelfo
-    guelfo = guelfoset(output=logset())
+    guelfo = guelfoset(output=logset(), pool=pool)
     """GUElfo instance"""
-    fcheck = checker_guelfoset()
+    fcheck = checker_guelfoset(pool=pool)
     """Folder Checker"""
     # Start GUElfo
     guelfo.start()
@@ -50,6 +71,8 @@ def main():
     # End the program
     fcheck.join()
     lcheck.join()
+    # Close the connections
+    pool.close()
 
 if __name__ == "__main__":
     main()
@@ -9,7 +9,8 @@ Requirements:
 - python3
 - python3-requests
 - python3-bs4
+- python3-aiohttp (optional, asyncio backend)
 '''
 
 sudo apt update
-sudo apt install -y python3 python3-pip python3-requests python3-bs4 
+sudo apt install -y python3 python3-pip python3-requests python3-bs4 python3-aiohttp 
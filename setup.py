@@ -10,9 +10,17 @@ import os
 from typing import Tuple
 from classes.cocito.eugolino import EUgolino
 from classes.cocito.guelfo import GUElfo
+from classes.cocito.sharded_eugolino import ShardedEUgolino
 from config import *
 
 from classes.log_manager import LogManager
+from classes.log_rotator import LogRotator
+from classes.http_pool import HTTPPool
+from classes.rate_limiter import RateLimiter
+from classes.retry_policy import RetryPolicy
+from classes.orchestrator import Orchestrator
+from classes.cocito.resolution_cache import ResolutionCache
+from classes.cocito.deduplicator import Deduplicator
 from classes.checkers.log_checker import LogChecker
 from classes.checkers.folder_checker import FolderChecker
 
@@ -23,63 +31,152 @@ def logset() -> LogManager:
     '''
     # Make the log directory if it doesn't exist
     os.makedirs(log_dir, exist_ok=True)
+    # Set up the rotation of the logs
+    rotator = LogRotator(max_bytes=log_max_bytes, interval=log_rotate_interval, backups=log_backups, compress=log_compress)
     # Set up a Logging Manager
-    log_manager = LogManager(out_file=outpath, err_file=errpath, duplicate=duplicate)
+    log_manager = LogManager(out_file=outpath, err_file=errpath, duplicate=duplicate, buffered=buffered_logs, flush_interval=log_flush_interval, flush_size=log_flush_size, rotator=rotator, events_file=eventpath if log_events else "")
     return log_manager
 
-def checkerset() -> Tuple[LogChecker, FolderChecker]:
+def poolset(share:int = 1) -> HTTPPool:
+    '''
+        This function sets up the pool of HTTP connections shared by the downloaders and the checkers.
+
+        Args:
+            share (int, optional): Number of processes sending requests at the same time, each one gets this share of the rates
+
+        Returns:
+            HTTPPool: The pool of HTTP connections
+    '''
+    # Set up the rate limiter shared by all the requests of the process
+    limiter = RateLimiter(rate=rate_limit / share, min_rate=rate_limit_min / share, max_rate=rate_limit_max / share, burst=rate_burst // share if rate_burst >= share else 1) if rate_limit > 0 else None
+    # Set up the HTTP Pool
+    pool = HTTPPool(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block, keep_alive=keep_alive, limiter=limiter, connect_timeout=connect_timeout, read_timeout=read_timeout)
+    # Return the HTTP Pool
+    return pool
+
+def retryset() -> RetryPolicy:
+    '''
+        This function sets up the retry policy of the downloads.
+
+        Returns:
+            RetryPolicy: The retry policy, None if the steps are attempted once
+    '''
+    if retry_attempts <= 1:
+        return None
+    return RetryPolicy(attempts=retry_attempts, backoff=retry_backoff, max_backoff=retry_max_backoff, statuses=retry_statuses)
+
+def checkerset(pool:HTTPPool = None) -> Tuple[LogChecker, FolderChecker]:
     '''
         This function sets up the checkers for the EUgolino project.
         It initializes the log checker and the folder checker and returns them.
 
+        Args:
+            pool (HTTPPool, optional): The pool of HTTP connections
+
         Returns:
             LogChecker: The log checker
             FolderChecker: The folder checker
     '''
     # Set up the Folder Checker
-    folder_checker = FolderChecker(directory=directory, max_len=max, name=fname, url=URL_FOL, sleep_time=sleep_time, send_check=send_check)
+    folder_checker = FolderChecker(directory=directory, max_len=max, name=fname, url=URL_FOL, sleep_time=sleep_time, send_check=send_check, pool=pool, watch=folder_watch, counter=folder_counter)
     # Set up the Log Checker
-    log_checker = LogChecker(log_err=errpath, log_out=outpath, name=lname, url=URL_LOG, sleep_time=sleep_time, send_check=send_check)
+    log_checker = LogChecker(log_err=errpath, log_out=outpath, name=lname, url=URL_LOG, sleep_time=sleep_time, send_check=send_check, pool=pool)
     # Return the checkers
     return folder_checker, log_checker
 
-def eugolinoset(output:LogManager) -> EUgolino:
+def eugolinoset(output:LogManager, pool:HTTPPool = None) -> EUgolino:
     '''
         This function sets up the EUgolino project.
         It initializes the EUgolino class and returns it.
 
+        Args:
+            output (LogManager): The log manager
+            pool (HTTPPool, optional): The pool of HTTP connections
+
         Returns:
             EUgolino: The EUgolino
     '''
+    # Set up the resolution cache
+    cache = ResolutionCache(resolution_cache, ttl=cache_ttl, max_size=cache_size) if resolution_cache != "" else None
+    # Set up the deduplicator
+    dedupl = Deduplicator(dedup, capacity=dedup_capacity, error_rate=dedup_error_rate) if dedup != "" else None
     # Set up the EUgolino
-    e = EUgolino(file_in=file, max_downloads=max, starting_point=starting_point, output=output, name=eugolino_name, destination=directory)
+    e = EUgolino(cache=cache, dedup=dedupl, retry=retryset(), file_in=file, max_downloads=max, starting_point=starting_point, output=output, name=eugolino_name, pool=pool, chunk_size=chunk_size, destination=directory, journal_file=journal, skip_existing=skip_existing, stream_import=stream_import, links_index=links_index, requeues=requeues, workers=workers, resolvers=resolvers, queue_size=queue_size, backend=backend, async_limit=async_limit, async_limit_per_host=async_limit_per_host)
     # Return the EUgolino
     return e
 
-def guelfoset(output:LogManager) -> GUElfo:
+def eugolino_shardset() -> EUgolino:
+    '''
+        This function sets up the EUgolino of a shard process.
+        It initializes the EUgolino class with its own log manager and pool and returns it.
+        The rate limiter of the pool is not shared by the processes, so each one gets its share of the rates.
+
+        Returns:
+            EUgolino: The EUgolino
+    '''
+    return eugolinoset(output=logset(), pool=poolset(share=shards))
+
+def shardset(output:LogManager) -> ShardedEUgolino:
+    '''
+        This function sets up the sharded EUgolino.
+        It initializes the ShardedEUgolino class, which runs one EUgolino for each shard process, and returns it.
+
+        Args:
+            output (LogManager): The log manager
+
+        Returns:
+            ShardedEUgolino: The sharded EUgolino
+    '''
+    # Set up the deduplicator of all the shards
+    dedupl = Deduplicator(dedup, capacity=dedup_capacity, error_rate=dedup_error_rate) if dedup != "" else None
+    return ShardedEUgolino(factory=eugolino_shardset, file_in=file, shards=shards, mode=shard_mode, starting_point=starting_point, max_downloads=max, output=output, name=eugolino_name, dedup=dedupl)
+
+def guelfoset(output:LogManager, pool:HTTPPool = None) -> GUElfo:
     '''
         This function sets up the GUElfo project.
         It initializes the EUgolino class and returns
         it.
 
+        Args:
+            output (LogManager): The log manager
+            pool (HTTPPool, optional): The pool of HTTP connections
+
         Returns:
             EUgolino: The GUElfo
     '''
+    # Set up the deduplicator
+    dedupl = Deduplicator(dedup, capacity=dedup_capacity, error_rate=dedup_error_rate) if dedup != "" else None
     # Set up the GUElfo
-    g:GUElfo = GUElfo(file_in=file_guelfo, max_downloads=max_guelfo, starting_point=starting_point_guelfo, output=output, name=guelfo_name, destination=directory_guelfo)
+    g:GUElfo = GUElfo(dedup=dedupl, retry=retryset(), file_in=file_guelfo, max_downloads=max_guelfo, starting_point=starting_point_guelfo, output=output, name=guelfo_name, pool=pool, chunk_size=chunk_size, destination=directory_guelfo, journal_file=journal_guelfo, skip_existing=skip_existing_guelfo, stream_import=stream_import, links_index=links_index, requeues=requeues, workers=workers_guelfo, backend=backend, async_limit=async_limit, async_limit_per_host=async_limit_per_host)
     # Return the GUElfo
     return g
 
-def checker_guelfoset() -> FolderChecker:
+def checker_guelfoset(pool:HTTPPool = None) -> FolderChecker:
     '''
         This function sets up the checker for the GUElfo project.
         It initializes the folder checker and returns it.
 
+        Args:
+            pool (HTTPPool, optional): The pool of HTTP connections
+
         Returns:
             FolderChecker: The folder checker
     '''
     # Set up the Folder Checker
-    folder_checker = FolderChecker(directory=directory_guelfo, max_len=max_guelfo, name=fname, url=URL_FOL, sleep_time=sleep_time, send_check=send_check)
+    folder_checker = FolderChecker(directory=directory_guelfo, max_len=max_guelfo, name=fname, url=URL_FOL, sleep_time=sleep_time, send_check=send_check, pool=pool, watch=folder_watch, counter=folder_counter)
     # Return the checkers
     return folder_checker
 
+def orchestratorset(output:LogManager) -> Orchestrator:
+    '''
+        This function sets up the orchestrator of the downloaders.
+        It initializes the Orchestrator class and returns it.
+
+        Args:
+            output (LogManager): The log manager
+
+        Returns:
+            Orchestrator: The orchestrator
+    '''
+    # Set up the Orchestrator
+    return Orchestrator(budget=budget, delay=delay, output=output)